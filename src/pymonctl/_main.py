@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import selectors
+import socket
 import sys
 import threading
 from abc import abstractmethod, ABC
@@ -26,11 +28,11 @@ def getAllMonitors() -> list[Monitor]:
 
     :return: list of Monitor instances
     """
-    global _updateScreens
-    if _updateScreens is None:
+    updateScreens = _watchdog.updateScreens
+    if updateScreens is None:
         return _getAllMonitors()
     else:
-        return _updateScreens.getMonitors()
+        return updateScreens.getMonitors()
 
 
 def getAllMonitorsDict() -> dict[str, ScreenValue]:
@@ -70,20 +72,21 @@ def getAllMonitorsDict() -> dict[str, ScreenValue]:
             "colordepth":
                 Bits per pixel referred to the display color depth
     """
-    global _updateScreens
-    if _updateScreens is None:
+    updateScreens = _watchdog.updateScreens
+    if updateScreens is None:
         return _getAllMonitorsDict()
     else:
-        return _updateScreens.getScreens()
+        return updateScreens.getScreens()
 
 
 def getMonitorsData(handle: Optional[int] = None):
     # Linux ONLY since X11 is not thread-safe (randr crashes when querying in parallel from separate thread)
     if sys.platform == "linux":
-        if _updateScreens is None:
+        updateScreens = _watchdog.updateScreens
+        if updateScreens is None:
             return _getMonitorsData(handle)
         else:
-            return _updateScreens.getMonitorsData(handle)
+            return updateScreens.getMonitorsData(handle)
     return []
 
 
@@ -660,11 +663,19 @@ class BaseMonitor(ABC):
         raise NotImplementedError
 
 
-_updateRequested = False
-_plugListeners: List[Callable[[List[str], dict[str, ScreenValue]], None]] = []
-_changeListeners: List[Callable[[List[str], dict[str, ScreenValue]], None]] = []
-_kill = threading.Event()
-_interval = 0.5
+class _WatchdogState:
+
+    def __init__(self):
+        # All watchdog-related state in one place, so it can be accessed through a single (local) reference
+        self.updateScreens: Optional[_UpdateScreens] = None
+        self.updateRequested = False
+        self.plugListeners: List[Callable[[List[str], dict[str, ScreenValue]], None]] = []
+        self.changeListeners: List[Callable[[List[str], dict[str, ScreenValue]], None]] = []
+        self.kill = threading.Event()
+        self.interval = 0.5
+
+
+_watchdog = _WatchdogState()
 
 
 class _UpdateScreens(threading.Thread):
@@ -674,6 +685,11 @@ class _UpdateScreens(threading.Thread):
 
         self._kill = kill
         self._interval = interval
+        # Waiting on a selector (instead of kill.wait()) allows to wake the thread up as soon as it has to stop
+        self._selector = selectors.DefaultSelector()
+        self._wakeupRecv, self._wakeupSend = socket.socketpair()
+        self._wakeupRecv.setblocking(False)
+        self._selector.register(self._wakeupRecv, selectors.EVENT_READ)
         self._screens: dict[str, ScreenValue] = {}
         if sys.platform == "linux":
             import Xlib.display
@@ -709,9 +725,7 @@ class _UpdateScreens(threading.Thread):
             On / Off / Standby
             Attach / Detach
         """
-        global _updateRequested
-        global _plugListeners
-        global _changeListeners
+        watchdog = _watchdog
 
         while not self._kill.is_set():
 
@@ -724,25 +738,43 @@ class _UpdateScreens(threading.Thread):
             newScreens = list(screens.keys())
             currentScreens = list(self._screens.keys())
 
-            if _plugListeners:
+            if watchdog.plugListeners:
                 names = [s for s in newScreens if s not in currentScreens] + \
                         [s for s in currentScreens if s not in newScreens]
                 if names:
-                    for listener in _plugListeners:
+                    for listener in watchdog.plugListeners:
                         listener(names, screens)
 
-            if _changeListeners:
+            if watchdog.changeListeners:
                 names = [s for s in newScreens if s in currentScreens and screens[s] != self._screens[s]]
                 if names:
-                    for listener in _changeListeners:
+                    for listener in watchdog.changeListeners:
                         listener(names, screens)
 
             self._screens = screens
 
-            self._kill.wait(self._interval)
+            self._wait()
+
+        self._selector.close()
+        self._wakeupRecv.close()
+        self._wakeupSend.close()
+
+    def _wait(self):
+        if self._selector.select(self._interval):
+            try:
+                self._wakeupRecv.recv(1024)
+            except OSError:
+                pass
+
+    def wakeup(self):
+        try:
+            self._wakeupSend.send(b"\x00")
+        except OSError:
+            pass
 
     def updateInterval(self, interval: float):
         self._interval = interval
+        self.wakeup()
 
     def getScreens(self) -> dict[str, ScreenValue]:
         return self._screens
@@ -762,14 +794,11 @@ class _UpdateScreens(threading.Thread):
             for monitorData in self._monitorsData:
                 display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData
                 if handle == output:
-                    return [(display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo)]
+                    return [monitorData]
             return []
         return self._monitorsData
 
 
-_updateScreens: Optional[_UpdateScreens] = None
-
-
 def enableUpdateInfo():
     """
     Enable this only if you need to keep track of monitor-related events like changing its resolution, position,
@@ -783,8 +812,7 @@ def enableUpdateInfo():
     If disabled, the information on the monitors connected to the system will be updated right at the moment,
     but this might be slow and CPU-consuming, especially if quickly and repeatedly invoked.
     """
-    global _updateRequested
-    _updateRequested = True
+    _watchdog.updateRequested = True
     _startUpdateScreens()
 
 
@@ -795,11 +823,9 @@ def disableUpdateInfo():
 
     Enable this process again, or invoke getMonitors() function if you need updated info.
     """
-    global _updateRequested
-    _updateRequested = False
-    global _plugListeners
-    global _changeListeners
-    if not _plugListeners and not _changeListeners:
+    watchdog = _watchdog
+    watchdog.updateRequested = False
+    if not watchdog.plugListeners and not watchdog.changeListeners:
         _killUpdateScreens()
 
 
@@ -818,9 +844,9 @@ def plugListenerRegister(monitorCountChanged: Callable[[List[str], dict[str, Scr
 
     :param monitorCountChanged: callback to be invoked in case the number of monitor connected changes
     """
-    global _plugListeners
-    if monitorCountChanged not in _plugListeners:
-        _plugListeners.append(monitorCountChanged)
+    plugListeners = _watchdog.plugListeners
+    if monitorCountChanged not in plugListeners:
+        plugListeners.append(monitorCountChanged)
         _startUpdateScreens()
 
 
@@ -831,15 +857,13 @@ def plugListenerUnregister(monitorCountChanged: Callable[[List[str], dict[str, S
 
     :param monitorCountChanged: callback previously registered
     """
-    global _plugListeners
+    watchdog = _watchdog
     try:
-        objIndex = _plugListeners.index(monitorCountChanged)
-        _plugListeners.pop(objIndex)
+        objIndex = watchdog.plugListeners.index(monitorCountChanged)
+        watchdog.plugListeners.pop(objIndex)
     except:
         pass
-    global _changeListeners
-    global _updateRequested
-    if not _plugListeners and not _changeListeners and not _updateRequested:
+    if not watchdog.plugListeners and not watchdog.changeListeners and not watchdog.updateRequested:
         _killUpdateScreens()
 
 
@@ -858,9 +882,9 @@ def changeListenerRegister(monitorPropsChanged: Callable[[List[str], dict[str, S
 
     :param monitorPropsChanged: callback to be invoked in case the number of monitor properties change
     """
-    global _changeListeners
-    if monitorPropsChanged not in _changeListeners:
-        _changeListeners.append(monitorPropsChanged)
+    changeListeners = _watchdog.changeListeners
+    if monitorPropsChanged not in changeListeners:
+        changeListeners.append(monitorPropsChanged)
         _startUpdateScreens()
 
 
@@ -871,36 +895,41 @@ def changeListenerUnregister(monitorPropsChanged: Callable[[List[str], dict[str,
 
     :param monitorPropsChanged: callback previously registered
     """
-    global _changeListeners
+    watchdog = _watchdog
     try:
-        objIndex = _changeListeners.index(monitorPropsChanged)
-        _changeListeners.pop(objIndex)
+        objIndex = watchdog.changeListeners.index(monitorPropsChanged)
+        watchdog.changeListeners.pop(objIndex)
     except:
         pass
-    global _plugListeners
-    global _updateRequested
-    if not _plugListeners and not _changeListeners and not _updateRequested:
+    if not watchdog.plugListeners and not watchdog.changeListeners and not watchdog.updateRequested:
         _killUpdateScreens()
 
 
 def _startUpdateScreens():
-    global _updateScreens
-    if _updateScreens is None:
-        global _kill
-        _kill.clear()
-        global _interval
-        _updateScreens = _UpdateScreens(_kill, _interval)
-        _updateScreens.daemon = True
-        _updateScreens.start()
+    watchdog = _watchdog
+    if watchdog.updateScreens is None:
+        watchdog.kill.clear()
+        updateScreens = _UpdateScreens(watchdog.kill, watchdog.interval)
+        updateScreens.daemon = True
+        watchdog.updateScreens = updateScreens
+        updateScreens.start()
+
+
+def _wakeupUpdateScreens():
+    # Used by platform event listeners (Linux RandR) to make the watchdog refresh right away
+    updateScreens = _watchdog.updateScreens
+    if updateScreens is not None:
+        updateScreens.wakeup()
 
 
 def _killUpdateScreens():
-    global _updateScreens
-    if _updateScreens is not None:
-        global _kill
-        _kill.set()
-        _updateScreens.join()
-        _updateScreens = None
+    watchdog = _watchdog
+    updateScreens = watchdog.updateScreens
+    if updateScreens is not None:
+        watchdog.kill.set()
+        updateScreens.wakeup()
+        updateScreens.join()
+        watchdog.updateScreens = None
 
 
 def isWatchdogEnabled() -> bool:
@@ -911,8 +940,7 @@ def isWatchdogEnabled() -> bool:
 
     :return: Return ''True'' is process (thread) is alive
     """
-    global _updateScreens
-    return bool(_updateScreens is not None)
+    return bool(_watchdog.updateScreens is not None)
 
 
 def isUpdateInfoEnabled() -> bool:
@@ -921,8 +949,7 @@ def isUpdateInfoEnabled() -> bool:
 
     :return: Returns ''True'' if enabled.
     """
-    global _updateRequested
-    return _updateRequested
+    return _watchdog.updateRequested
 
 
 def isPlugListenerRegistered(monitorCountChanged: Callable[[List[str], dict[str, ScreenValue]], None]):
@@ -931,8 +958,7 @@ def isPlugListenerRegistered(monitorCountChanged: Callable[[List[str], dict[str,
 
     :return: Returns ''True'' if registered
     """
-    global _plugListeners
-    return monitorCountChanged in _plugListeners
+    return monitorCountChanged in _watchdog.plugListeners
 
 
 def isChangeListenerRegistered(monitorPropsChanged: Callable[[List[str], dict[str, ScreenValue]], None]):
@@ -941,8 +967,7 @@ def isChangeListenerRegistered(monitorPropsChanged: Callable[[List[str], dict[st
 
     :return: Returns ''True'' if registered
     """
-    global _changeListeners
-    return monitorPropsChanged in _changeListeners
+    return monitorPropsChanged in _watchdog.changeListeners
 
 
 def updateWatchdogInterval(interval: float):
@@ -958,11 +983,11 @@ def updateWatchdogInterval(interval: float):
 
     :param interval: new interval value in seconds (or fractions), as float.
     """
-    global _updateScreens
-    if interval > 0 and _updateScreens is not None:
-        _updateScreens.updateInterval(interval)
-        global _interval
-        _interval = interval
+    watchdog = _watchdog
+    updateScreens = watchdog.updateScreens
+    if interval > 0 and updateScreens is not None:
+        updateScreens.updateInterval(interval)
+        watchdog.interval = interval
 
 
 def _getRelativePosition(monitor, relativeTo) -> Tuple[int, int]:
@@ -4,30 +4,49 @@ from __future__ import annotations
 
 import sys
 
-assert sys.platform == "linux"
+if sys.platform != "linux":
+    raise ImportError("_pymonctl_linux requires Linux")
 
+import atexit
 import math
 import os
+import re
+import selectors
+import shutil
+import socket
 import subprocess
 import threading
+import time
+import weakref
 
-from typing import Optional, List, Union, Tuple, NamedTuple
+from functools import cached_property
+from typing import Optional, List, Union, Tuple, NamedTuple, Callable, Any, cast
 
+# Displays opened after this import use real locks, so they can be shared amongst threads. This includes ewmhlib's
+# default display only if ewmhlib was not imported (thus already opening it) before this module
+import Xlib.threaded
 import Xlib.display
+import Xlib.error
 import Xlib.X
 import Xlib.protocol
 import Xlib.xobject
 from Xlib.protocol.rq import Struct
 from Xlib.xobject.drawable import Window as XWindow
-from Xlib.ext import randr
+from Xlib.ext import randr, dpms
 
 from ._main import BaseMonitor, _pointInBox, _getRelativePosition, getMonitorsData, isWatchdogEnabled, \
-                   DisplayMode, ScreenValue, Box, Rect, Point, Size, Position, Orientation
-from ewmhlib import defaultEwmhRoot, getProperty, getPropertyValue, getRoots, Props
+                   _wakeupUpdateScreens, DisplayMode, ScreenValue, Box, Rect, Point, Size, Position, Orientation
+from ewmhlib import defaultEwmhRoot, Props
+
+# Desktop environment and session type will not change while running
+_isGnome = "gnome" in os.environ.get('XDG_CURRENT_DESKTOP', '').lower()
+_isWayland = "wayland" in os.environ.get('XDG_SESSION_TYPE', '').lower()
+_isCinnamon = os.environ.get('DESKTOP_SESSION', "").lower() == "cinnamon"
 
 
 def _getAllMonitors() -> list[LinuxMonitor]:
-    return [LinuxMonitor(monitor.crtcs[0]) for monitor in _XgetMonitors()]
+    return [LinuxMonitor._fromMonitorData(display, screen, root, monitor.crtcs[0], monName)
+            for display, screen, root, monitor, monName in _XgetAllMonitors()]
 
 
 def _getAllMonitorsDict() -> dict[str, ScreenValue]:
@@ -35,55 +54,233 @@ def _getAllMonitorsDict() -> dict[str, ScreenValue]:
     # https://www.x.org/releases/X11R7.7/doc/libX11/libX11/libX11.html#Obtaining_Information_about_the_Display_Image_Formats_or_Screens
     # https://github.com/alexer/python-xlib/blob/master/examples/xrandr.py
     monitorsDict: dict[str, ScreenValue] = {}
+    workAreas: dict[int, Optional[List[int]]] = {}
+    # GNOME global scale is the same for all monitors, so it is requested just once per pass
+    globalScale = _GNOME_getGlobalScale()
     for monitorData in getMonitorsData():
         display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData
-        monitorsDict[monName] = _buildMonitorsDict(display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo)
+        wa = _XgetWorkArea(display, root, workAreas)
+        modes = _XgetModes(res).byId
+        monitorsDict[monName] = _buildMonitorsDict(display, screen, root, res, monitor, monName, output, outputInfo,
+                                                   crtc, crtcInfo, wa, modes, globalScale)
     return monitorsDict
 
 
-def _getAllMonitorsDictThread() -> (Tuple[dict[str, ScreenValue],
-                                          List[Tuple[Xlib.display.Display, Struct, XWindow, randr.GetScreenResourcesCurrent,
-                                                     randr.MonitorInfo, str, int, randr.GetOutputInfo, int, randr.GetCrtcInfo]]]):
+def _getAllMonitorsDictThread() -> Tuple[dict[str, ScreenValue], List[_MonitorData]]:
     # display connections seem to fail when shared amongst threads and/or queried too quickly in parallel
+    # Monitors info is already fetched (in one pass) by then, so building each entry needs no extra threads
+    global _lastMonitorsDict
     monitorsDict: dict[str, ScreenValue] = {}
-    monitorsData: List[Tuple[Xlib.display.Display, Struct, XWindow, randr.GetScreenResourcesCurrent,
-                             randr.MonitorInfo, str, int, randr.GetOutputInfo, int, randr.GetCrtcInfo]] = []
-    for monitorData in _getMonitorsData():
+    monitorsData: List[_MonitorData] = []
+    workAreas: dict[int, Optional[List[int]]] = {}
+    # GNOME global scale is the same for all monitors, so it is requested just once per pass
+    globalScale = _GNOME_getGlobalScale()
+    cachedData = _getMonitorsData()
+    for monitorData in cachedData:
+        _XgetWorkArea(monitorData.display, monitorData.root, workAreas)
+    # While RandR events are received, nothing changed if cache wasn't refreshed (and work areas are the same),
+    # so previous pass can be reused
+    generation = _monitorCache.getGeneration()
+    lastMonitorsDict = _lastMonitorsDict
+    if (generation is not None and lastMonitorsDict is not None and lastMonitorsDict[0] == generation
+            and lastMonitorsDict[1] == globalScale and lastMonitorsDict[2] == workAreas):
+        # Copies are returned, since watchdog will hand these out to callers
+        return ({monName: cast(ScreenValue, dict(value)) for monName, value in lastMonitorsDict[3].items()},
+                list(lastMonitorsDict[4]))
+    for monitorData in cachedData:
         display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData
-        monitorsDict[monName] = _buildMonitorsDict(display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo)
-        monitorsData.append((display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo))
+        wa = _XgetWorkArea(display, root, workAreas)
+        modes = _XgetModes(res).byId
+        monitorsDict[monName] = _buildMonitorsDict(display, screen, root, res, monitor, monName, output, outputInfo,
+                                                   crtc, crtcInfo, wa, modes, globalScale)
+        monitorsData.append(monitorData)
+    if generation is not None:
+        _lastMonitorsDict = (generation, globalScale, dict(workAreas),
+                             {monName: cast(ScreenValue, dict(value)) for monName, value in monitorsDict.items()},
+                             list(monitorsData))
     return monitorsDict, monitorsData
 
 
-def _buildMonitorsDict(display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo) -> ScreenValue:
+_lastMonitorsDict: Optional[Tuple[int, Optional[float], dict[int, Optional[List[int]]], dict[str, ScreenValue],
+                                  List[_MonitorData]]] = None
+
+
+def _XgetWorkArea(display: Xlib.display.Display, root: XWindow,
+                  workAreas: Optional[dict[int, Optional[List[int]]]] = None) -> Optional[List[int]]:
+    # WORKAREA is a root property, so it is requested just once per root when building info for several monitors
+    if workAreas is not None and id(root) in workAreas:
+        return workAreas[id(root)]
+    if _monitorCache.start():
+        wa = _monitorCache.getWorkArea(display, root)
+    else:
+        wa = _XqueryWorkArea(display, root)
+    if workAreas is not None:
+        workAreas[id(root)] = wa
+    return wa
+
+
+def _XqueryWorkArea(display: Xlib.display.Display, root: XWindow) -> Optional[List[int]]:
+    # WORKAREA is a plain CARDINAL list, so there's no need to go through ewmhlib's generic property helpers
+    prop = _XgetAtom(display, Props.Root.WORKAREA)
+    try:
+        reply = root.get_full_property(prop, Xlib.X.AnyPropertyType)
+    except Xlib.error.XError:
+        # Some apps/environments do not set it
+        return None
+    if reply is not None and reply.value:
+        return list(reply.value)
+    return None
+
+
+class _ResModes(NamedTuple):
+    byId: dict[int, DisplayMode]
+    byMode: dict[DisplayMode, int]
+
+
+_resModes: weakref.WeakKeyDictionary[randr.GetScreenResourcesCurrent, _ResModes] = weakref.WeakKeyDictionary()
+
+
+def _XgetModes(res: randr.GetScreenResourcesCurrent) -> _ResModes:
+    # Modes will not change for the same screen resources, so sizes and refresh rates are calculated only once
+    modes = _resModes.get(res)
+    if modes is None:
+        byId: dict[int, DisplayMode] = {}
+        byMode: dict[DisplayMode, int] = {}
+        for resMode in res.modes:
+            if resMode.h_total != 0 and resMode.v_total != 0:
+                freq = round(resMode.dot_clock / (resMode.h_total * resMode.v_total), 2)
+            else:
+                freq = 0.0
+            mode = DisplayMode(resMode.width, resMode.height, freq)
+            byId[resMode.id] = mode
+            byMode.setdefault(mode, resMode.id)
+        modes = _ResModes(byId, byMode)
+        _resModes[res] = modes
+    return modes
+
+
+def _XgetModeId(res: randr.GetScreenResourcesCurrent, outputModes: List[int], mode: DisplayMode) -> Optional[int]:
+    # Same criteria than xrandr: matching size and closest refresh rate
+    modes = _XgetModes(res)
+    modeId = modes.byMode.get(mode)
+    if modeId is not None and modeId in outputModes:
+        return modeId
+    modeId = None
+    diff = 0.0
+    for outMode in outputModes:
+        resMode = modes.byId.get(outMode)
+        if resMode is not None and resMode.width == mode.width and resMode.height == mode.height:
+            if modeId is None or abs(resMode.frequency - mode.frequency) < diff:
+                modeId = outMode
+                diff = abs(resMode.frequency - mode.frequency)
+    return modeId
+
+
+def _XgetGammaValues(red: List[int], green: List[int], blue: List[int]) -> (
+                        Optional[Tuple[float, Tuple[float, float, float]]]):
+    # Replicates xrandr algorithm to get brightness and gamma from crtc gamma ramps, but taking each sample at the
+    # same point xrandr uses to build the ramp (i / (size - 1)), so the values it sets are got back without any bias
+    size = len(red)
+    if size < 3 or len(green) != size or len(blue) != size:
+        return None
+
+    def lastNonClamped(ramp: List[int]) -> int:
+        for i in range(size - 1, 0, -1):
+            if ramp[i] < 0xffff:
+                return i
+        return 0
+
+    def sample(ramp: List[int], i: int) -> Tuple[float, float]:
+        # Ramp values are truncated when set, so the middle of the interval is the closest to the original value
+        return i / (size - 1), (ramp[i] + 0.5) / 65535
+
+    lastRed, lastGreen, lastBlue = lastNonClamped(red), lastNonClamped(green), lastNonClamped(blue)
+    best, lastBest = red, lastRed
+    if lastGreen > lastBest:
+        best, lastBest = green, lastGreen
+    if lastBlue > lastBest:
+        best, lastBest = blue, lastBlue
+    if lastBest == 0:
+        lastBest = 1
+    if best[lastBest] / 65535 < 0.0001:
+        # Screen is black
+        return 0.0, (1.0, 1.0, 1.0)
+    i1, v1 = sample(best, max(lastBest // 2, 1))
+    i2, v2 = sample(best, lastBest)
+    try:
+        if lastBest + 1 == size:
+            brightness = v2
+        else:
+            brightness = math.exp((math.log(v2) * math.log(i1) - math.log(v1) * math.log(i2)) / math.log(i1 / i2))
+        gamma: List[float] = []
+        for ramp, last in ((red, lastRed), (green, lastGreen), (blue, lastBlue)):
+            i, v = sample(ramp, max(last // 2, 1))
+            gamma.append(math.log(v / brightness) / math.log(i))
+    except (ValueError, ZeroDivisionError):
+        return None
+    # Full precision values, so callers rounding them (e.g. to percentages) get back the values that were set
+    return brightness, (gamma[0], gamma[1], gamma[2])
+
+
+def _XisBrightnessSet(red: List[int], green: List[int], blue: List[int], brightness: float) -> bool:
+    # Compares current ramps to the ones xrandr would set for given brightness (keeping current gamma). Values may
+    # differ by one unit due to truncation, whilst a 1% brightness change moves the top of the ramp by 655 units,
+    # so half of it is tolerated (no actual change is ever skipped)
+    values = _XgetGammaValues(red, green, blue)
+    if values is None:
+        return False
+    size = len(red)
+    tolerance = 65535 / 200
+    for ramp, gamma in zip((red, green, blue), values[1]):
+        for i, value in enumerate(ramp):
+            if abs(value - int(min(math.pow(i / (size - 1), gamma) * brightness, 1.0) * 65535.0)) > tolerance:
+                return False
+    return True
+
+
+def _XsetCrtcConfig(display: Xlib.display.Display, res: randr.GetScreenResourcesCurrent, crtc: int,
+                    crtcInfo: randr.GetCrtcInfo, mode: Optional[int] = None, rotation: Optional[int] = None) -> bool:
+    # Reconfigure CRTC directly, instead of spawning a new xrandr process which needs to re-query all RandR info
+    # It may fail in some cases (e.g. new mode doesn't fit current screen size), so caller must fall back to xrandr
+    try:
+        ret = randr.set_crtc_config(display, crtc, res.config_timestamp, crtcInfo.x, crtcInfo.y,
+                                    crtcInfo.mode if mode is None else mode,
+                                    crtcInfo.rotation if rotation is None else rotation,
+                                    crtcInfo.outputs)
+        return bool(ret.status == randr.SetConfigSuccess)
+    except Xlib.error.XError:
+        return False
+
+
+def _rotationIndex(rotation: int) -> int:
+    # Index of the lowest bit set, that is, the rotation (reflection bits, if any, are higher)
+    # Rotation is 0 if the crtc is not in use
+    return (rotation & -rotation).bit_length() - 1 if rotation else 0
+
+
+def _buildMonitorsDict(display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo,
+                       wa: Optional[List[int]], modes: dict[int, DisplayMode],
+                       globalScale: Optional[float]) -> ScreenValue:
 
     is_primary = monitor.primary == 1
     x, y, w, h = monitor.x, monitor.y, monitor.width_in_pixels, monitor.height_in_pixels
-    wa: List[int] = getPropertyValue(getProperty(window=root, prop=Props.Root.WORKAREA, display=display),
-                                     display=display)
     # Thanks to odknt (https://github.com/odknt) for his HELP!!!
     if isinstance(wa, list) and len(wa) >= 4:
         wx, wy, wr, wb = wa[0], wa[1], wa[2], wa[3]
     else:
         wx, wy, wr, wb = x, y, w, h
-    mm_width = monitor.width_in_millimeters or outputInfo.mm_width
-    mm_height = monitor.height_in_millimeters or outputInfo.mm_height
-    if mm_width != 0 and mm_height != 0:
-        dpiX, dpiY = round((w * 25.4) / mm_width), round((h * 25.4) / mm_height)
+    dpiX, dpiY = _getDpi(monitor, outputInfo)
+    if globalScale is not None:
+        scaleX, scaleY = globalScale, globalScale
     else:
-        dpiX, dpiY = 0.0, 0.0
-    scaleX, scaleY = _scale(monName) or (0.0, 0.0)
-    rotValue = int(math.log(crtcInfo.rotation, 2))
+        scaleX, scaleY = _XgetScale(monitor, outputInfo, modes) or (0.0, 0.0)
+    rotValue = _rotationIndex(crtcInfo.rotation)
     if rotValue in (Orientation.NORMAL, Orientation.LEFT, Orientation.RIGHT, Orientation.INVERTED):
         rot = Orientation(rotValue)
     else:
         rot = rotValue
-    freq = 0.0
-    for mode in res.modes:
-        if crtcInfo.mode == mode.id:
-            if mode.h_total != 0 and mode.v_total != 0:
-                freq = round(mode.dot_clock / (mode.h_total * mode.v_total), 2)
-            break
+    mode = modes.get(crtcInfo.mode)
+    freq = mode.frequency if mode is not None else 0.0
     depth = screen.root_depth
 
     return {
@@ -94,7 +291,7 @@ def _buildMonitorsDict(display, screen, root, res, monitor, monName, output, out
         'size': Size(w, h),
         'workarea': Rect(wx, wy, wr, wb),
         'scale': (scaleX, scaleY),
-        'dpi': (dpiX, dpiY),
+        'dpi': (int(dpiX), int(dpiY)),
         'orientation': rot,
         'frequency': freq,
         'colordepth': depth
@@ -102,31 +299,41 @@ def _buildMonitorsDict(display, screen, root, res, monitor, monName, output, out
 
 
 def _getMonitorsCount() -> int:
-    return len(_XgetMonitors())
+    _checkEnvironment()
+    if isWatchdogEnabled():
+        return len(getMonitorsData())
+    return _monitorCache.getMonitorsCount()
 
 
 def _findMonitor(x: int, y: int) -> List[LinuxMonitor]:
-    monitors = []
-    for monitor in _XgetMonitors():
-        if _pointInBox(x, y, monitor.x, monitor.y, monitor.width_in_pixels, monitor.height_in_pixels):
-            monitors.append(LinuxMonitor(monitor.crtcs[0]))
-    return monitors
+    if isWatchdogEnabled():
+        monitors = []
+        for monitorData in getMonitorsData():
+            display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData
+            if _pointInBox(x, y, monitor.x, monitor.y, monitor.width_in_pixels, monitor.height_in_pixels):
+                monitors.append(LinuxMonitor._fromMonitorData(display, screen, root, output, monName))
+        return monitors
+    return [LinuxMonitor._fromMonitorData(monitorData.display, monitorData.screen, monitorData.root,
+                                          monitorData.output, monitorData.monName)
+            for monitorData in _monitorCache.findMonitors(x, y)]
 
 
 def _getPrimary() -> LinuxMonitor:
     return LinuxMonitor()
 
 
-def _arrangeMonitors(arrangement: dict[str, dict[str, Optional[Union[str, int, Position, Point, Size]]]]):
+def _arrangeMonitors(arrangement: dict[str, dict[str, Optional[Union[str, int, Position, Point, Size]]]],
+                     monitors: Optional[dict[str, dict[str, randr.MonitorInfo]]] = None):
 
-    monitors = _XgetMonitorsDict()
+    if monitors is None:
+        monitors = _XgetMonitorsDict()
     setAsPrimary = ""
-    for monName in arrangement.keys():
+    for monName in arrangement:
         relPos = arrangement[monName]["relativePos"]
         relMon = arrangement[monName].get("relativeTo", "")
-        if (monName not in monitors.keys() or
+        if (monName not in monitors or
                 ((isinstance(relPos, Position) or isinstance(relPos, int)) and
-                 ((relMon and relMon not in monitors.keys()) or (not relMon and relPos != Position.PRIMARY)))):
+                 ((relMon and relMon not in monitors) or (not relMon and relPos != Position.PRIMARY)))):
             return
         elif relPos == Position.PRIMARY or relPos == (0, 0) or relPos == Point(0, 0):
             setAsPrimary = monName
@@ -148,7 +355,7 @@ def _arrangeMonitors(arrangement: dict[str, dict[str, Optional[Union[str, int, P
         newPos[setAsPrimary] = {"x": 0, "y": 0}
         arrangement.pop(setAsPrimary)
 
-    for monName in arrangement.keys():
+    for monName in arrangement:
 
         arrInfo = arrangement[monName]
         relativePos: Union[Position, int, Point, Tuple[int, int]] = arrInfo["relativePos"]
@@ -168,7 +375,7 @@ def _arrangeMonitors(arrangement: dict[str, dict[str, Optional[Union[str, int, P
                          "size": Size(targetMonInfo.width_in_pixels, targetMonInfo.height_in_pixels)}
 
             relMonInfo = monitors[relativeTo]["monitor"]
-            if relativeTo in newPos.keys():
+            if relativeTo in newPos:
                 relX, relY = newPos[relativeTo]["x"], newPos[relativeTo]["y"]
             else:
                 relX, relY = relMonInfo.x, relMonInfo.y
@@ -198,6 +405,7 @@ def _arrangeMonitors(arrangement: dict[str, dict[str, Optional[Union[str, int, P
     if newArrangement:
         cmd = _buildCommand(newArrangement, xOffset, yOffset)
         _, _ = _runProc(cmd)
+        _monitorCache.invalidate()
 
 
 def _getMousePos() -> Point:
@@ -210,7 +418,8 @@ def _getMousePos() -> Point:
     return Point(mp.root_x, mp.root_y)
 
 
-_rotations = ["normal", "left", "inverted", "right"]
+# xrandr rotation names, indexed by Orientation value (which is also the RandR rotation bit index)
+_rotations: Tuple[str, ...] = ("normal", "left", "inverted", "right")
 
 
 class LinuxMonitor(BaseMonitor):
@@ -230,19 +439,25 @@ class LinuxMonitor(BaseMonitor):
         else:
             raise ValueError
 
+    @classmethod
+    def _fromMonitorData(cls, display: Xlib.display.Display, screen: Struct, root: XWindow,
+                         handle: int, name: str) -> LinuxMonitor:
+        # Instance built from monitor info already retrieved, to avoid querying it again in __init__()
+        monitor = cls.__new__(cls)
+        monitor.display, monitor.screen, monitor.root, monitor.handle, monitor.name = display, screen, root, handle, name
+        return monitor
+
     @property
     def size(self) -> Optional[Size]:
-        monitors = _XgetMonitors(self.name)
-        if monitors:
-            monitor = monitors[0]
+        monitor = _XgetMonitor(self.name)
+        if monitor is not None:
             return Size(monitor.width_in_pixels, monitor.height_in_pixels)
         return None
 
     @property
     def workarea(self) -> Optional[Rect]:
         # https://askubuntu.com/questions/1124149/how-to-get-taskbar-size-and-position-with-python
-        wa: List[int] = getPropertyValue(
-            getProperty(window=self.root, prop=Props.Root.WORKAREA, display=self.display), display=self.display)
+        wa = _XgetWorkArea(self.display, self.root)
         if wa:
             wx, wy, wr, wb = wa[0], wa[1], wa[2], wa[3]
             return Rect(wx, wy, wr, wb)
@@ -250,9 +465,8 @@ class LinuxMonitor(BaseMonitor):
 
     @property
     def position(self) -> Optional[Point]:
-        monitors = _XgetMonitors(self.name)
-        if monitors:
-            monitor = monitors[0]
+        monitor = _XgetMonitor(self.name)
+        if monitor is not None:
             return Point(monitor.x, monitor.y)
         return None
 
@@ -260,17 +474,12 @@ class LinuxMonitor(BaseMonitor):
         # https://askubuntu.com/questions/1193940/setting-monitor-scaling-to-200-with-xrandr
         arrangement: dict[str, dict[str, Optional[Union[str, int, Position, Point, Size]]]] = {}
         monitors: dict[str, dict[str, randr.MonitorInfo]] = _XgetMonitorsDict()
-        monKeys = list(monitors.keys())
         if relativePos == Position.PRIMARY:
             monitor = monitors[self.name]["monitor"]
             if monitor.primary == 1:
                 return
             # For homogeneity, placing PRIMARY at (0, 0) and all the rest to RIGHT_TOP
-            try:
-                index = monKeys.index(self.name)
-                monKeys.pop(index)
-            except:
-                return
+            monKeys = [monName for monName in monitors if monName != self.name]
             arrangement[self.name] = {"relativePos": relativePos, "relativeTo": None}
             xOffset = monitor.width_in_pixels
             for monName in monKeys:
@@ -280,7 +489,7 @@ class LinuxMonitor(BaseMonitor):
 
         else:
 
-            for monName in monitors.keys():
+            for monName in monitors:
                 if monName == self.name:
                     relPos = relativePos
                     relTo = relativeTo
@@ -290,55 +499,59 @@ class LinuxMonitor(BaseMonitor):
                     relTo = None
                 arrangement[monName] = {"relativePos": relPos, "relativeTo": relTo}
 
-        _arrangeMonitors(arrangement)
+        # Monitors info has just been retrieved, no need to query it again
+        _arrangeMonitors(arrangement, monitors)
 
     @property
     def box(self) -> Optional[Box]:
-        monitors = _XgetMonitors(self.name)
-        if monitors:
-            monitor = monitors[0]
+        monitor = _XgetMonitor(self.name)
+        if monitor is not None:
             return Box(monitor.x, monitor.y, monitor.width_in_pixels, monitor.height_in_pixels)
         return None
 
     @property
     def rect(self) -> Optional[Rect]:
-        monitors = _XgetMonitors(self.name)
-        if monitors:
-            monitor = monitors[0]
+        monitor = _XgetMonitor(self.name)
+        if monitor is not None:
             return Rect(monitor.x, monitor.y, monitor.x + monitor.width_in_pixels, monitor.y + monitor.height_in_pixels)
         return None
 
     @property
     def scale(self) -> Optional[Tuple[float, float]]:
-        return _scale(self.name)
+        return _scale(self.handle)
 
     def setScale(self, scale: Optional[Tuple[float, float]], applyGlobally: bool = True):
         # https://askubuntu.com/questions/1193940/setting-monitor-scaling-to-200-with-xrandr
         # https://wiki.archlinux.org/title/HiDPI#GNOME
-        cmd = ""
+        global _globalScaleExpiry
+        cmd: List[str] = []
         if scale is not None and isinstance(scale, tuple):
-            if "gnome" in os.environ.get('XDG_CURRENT_DESKTOP', '').lower():
+            if _isGnome:
                 _GNOME_setGlobalScaling(applyGlobally)
                 if applyGlobally:
                     targetScale = min((1.0, 2.0, 3.0), key=lambda x: abs(x-(scale[0]/100)))
-                    cmd = '''gsettings set org.gnome.settings-daemon.plugins.xsettings overrides "[{'Gdk/WindowScalingFactor', <%s>}]"''' % int(targetScale)
+                    cmd = ["gsettings", "set", "org.gnome.settings-daemon.plugins.xsettings", "overrides",
+                           "[{'Gdk/WindowScalingFactor', <%s>}]" % int(targetScale)]
 
-            if not cmd and "wayland" not in os.environ.get('XDG_SESSION_TYPE', '').lower():
+            if not cmd and not _isWayland and scale[0] > 0 and scale[1] > 0:
                 scaleX, scaleY = round(100 / scale[0], 1), round(100 / scale[1], 1)
                 if 0 < scaleX <= 3 and 0 < scaleY <= 3:
                     # This is simpler but may lead to blurry results...
-                    cmd = "xrandr --output %s --scale %sx%s" % (self.name, scaleX, scaleY)
+                    cmd = ["xrandr", "--current", "--output", self.name, "--scale", "%sx%s" % (scaleX, scaleY)]
                     # ... try this instead? (must re-calculate monitor positions)
                     # cmd = self._buildScaleCmd((scaleX, scaleY)
             if cmd:
                 _, _ = _runProc(cmd)
+                _monitorCache.invalidate()
+            # GNOME scaling settings may have changed, so cached global scale can't be trusted anymore
+            _globalScaleExpiry = 0.0
 
-    def _buildScaleCmd(self, scale: Tuple[float, float]) -> str:
+    def _buildScaleCmd(self, scale: Tuple[float, float]) -> List[str]:
         # https://unix.stackexchange.com/questions/596887/how-to-scale-the-resolution-display-of-the-desktop-and-or-applications
         scaleX, scaleY = scale
-        cmd = ""
+        cmd: List[str] = []
         monitors = _getAllMonitorsDict()
-        for monName in monitors.keys():
+        for monName in monitors:
             monitor = monitors[monName]
 
             if monName == self.name:
@@ -348,7 +561,7 @@ class LinuxMonitor(BaseMonitor):
                     panX, panY = int(width * scaleX), int(height * scaleY)
                     newScaleX, newScaleY = scaleX, scaleY
                 else:
-                    return ""
+                    return []
 
             else:
                 mode = monitor["size"]
@@ -362,24 +575,20 @@ class LinuxMonitor(BaseMonitor):
 
             x, y = monitor["position"]
 
-            cmd += (" --output %s --mode %sx%s --panning %sx%s --scale %sx%s --pos %sx%s %s"
-                    % (monName, width, height, panX, panY, newScaleX, newScaleY, x, y,
-                       "--primary" if monitor.get("is_primary", False) else ""))
+            cmd += ["--output", monName, "--mode", "%sx%s" % (width, height), "--panning", "%sx%s" % (panX, panY),
+                    "--scale", "%sx%s" % (newScaleX, newScaleY), "--pos", "%sx%s" % (x, y)]
+            if monitor.get("is_primary", False):
+                cmd.append("--primary")
         if cmd:
-            cmd = "xrandr" + cmd
+            cmd = ["xrandr", "--current"] + cmd
         return cmd
 
     @property
     def dpi(self) -> Optional[Tuple[float, float]]:
-        monitors = _XgetMonitors(self.name)
-        if monitors:
-            monitor = monitors[0]
-            x, y, w, h = monitor.x, monitor.y, monitor.width_in_pixels, monitor.height_in_pixels
-            if monitor.width_in_millimeters != 0 and monitor.height_in_millimeters != 0:
-                dpiX, dpiY = round((w * 25.4) / monitor.width_in_millimeters), round((h * 25.4) / monitor.height_in_millimeters)
-            else:
-                dpiX, dpiY = 0.0, 0.0
-            return dpiX, dpiY
+        monitorData = getMonitorsData(self.handle)
+        if monitorData:
+            display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData[0]
+            return _getDpi(monitor, outputInfo)
         return None
 
     @property
@@ -387,100 +596,142 @@ class LinuxMonitor(BaseMonitor):
         monitorData = getMonitorsData(self.handle)
         if monitorData:
             display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData[0]
-            orientation = int(math.log(crtcInfo.rotation, 2))
+            orientation = _rotationIndex(crtcInfo.rotation)
             if orientation in (Orientation.NORMAL, Orientation.INVERTED, Orientation.LEFT, Orientation.RIGHT):
-                return Orientation(int(math.log(crtcInfo.rotation, 2)))
+                return Orientation(orientation)
         return None
 
     def setOrientation(self, orientation: Optional[Union[int, Orientation]]):
         if orientation is not None and orientation in (Orientation.NORMAL, Orientation.INVERTED, Orientation.LEFT, Orientation.RIGHT):
-            global _rotations
-            direction = _rotations[orientation]
-            cmd = "xrandr --output %s --rotate %s" % (self.name, direction)
-            _, _ = _runProc(cmd)
+            done = False
+            monitorData = getMonitorsData(self.handle)
+            if monitorData:
+                display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData[0]
+                # Keep reflection bits, as xrandr --rotate does
+                rotation = (1 << orientation) | (crtcInfo.rotation & ~0x0f)
+                if rotation == crtcInfo.rotation:
+                    return
+                done = _XsetCrtcConfig(display, res, crtc, crtcInfo, rotation=rotation)
+            if not done:
+                direction = _rotations[orientation]
+                cmd = ["xrandr", "--current", "--output", self.name, "--rotate", direction]
+                _, _ = _runProc(cmd)
+            _monitorCache.invalidate()
 
     @property
     def frequency(self) -> Optional[float]:
         monitorData = getMonitorsData(self.handle)
         if monitorData:
             display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData[0]
-            for mode in res.modes:
-                if crtcInfo.mode == mode.id:
-                    if mode.h_total != 0 and mode.v_total != 0:
-                        return float(round(mode.dot_clock / (mode.h_total * mode.v_total), 2))
-                    else:
-                        return 0.0
+            mode = _XgetModes(res).byId.get(crtcInfo.mode)
+            if mode is not None:
+                return float(mode.frequency)
         return None
     refreshRate = frequency
 
-    @property
+    @cached_property
     def colordepth(self) -> int:
+        # Root depth is fixed for the whole life of the screen
         return int(self.screen.root_depth)
 
     @property
     def brightness(self) -> Optional[int]:
         # https://manerosss.wordpress.com/2017/05/16/brightness-linux-xrandr/
+        gamma = self._getGamma()
+        if gamma is not None:
+            brightness, (r, g, b) = gamma
+            return round(brightness * 100)
         value = None
-        cmd = 'xrandr --verbose | grep %s -A 10 | grep "Brightness" | grep -o "[0-9].*"' % self.name
-        code, ret = _runProc(cmd)
+        ret, _ = _RgetBrightnessAndGamma(self.name)
         if ret:
             try:
-                value = int(float(ret) * 100)
-            except:
+                value = round(float(ret) * 100)
+            except ValueError:
                 pass
         return value
 
     def setBrightness(self, brightness: Optional[int]):
         if brightness is not None and 0 <= brightness <= 100:
+            # Current value is checked only if it can be read without spawning xrandr
+            ramps = self._getGammaRamps()
+            if ramps is not None and _XisBrightnessSet(ramps[0], ramps[1], ramps[2], brightness / 100):
+                return
             value = brightness / 100
             if 0 <= value <= 1:
-                cmd = "xrandr --output %s --brightness %s" % (self.name, str(value))
+                cmd = ["xrandr", "--current", "--output", self.name, "--brightness", str(value)]
                 _, _ = _runProc(cmd)
+                _RinvalidateBrightnessAndGamma()
 
     @property
     def contrast(self) -> Optional[int]:
+        gamma = self._getGamma()
+        if gamma is not None:
+            brightness, (r, g, b) = gamma
+            return round((((1 / (r or 1)) + (1 / (g or 1)) + (1 / (b or 1))) / 3) * 100)
         value = None
-        cmd = 'xrandr --verbose | grep %s -A 10 | grep "Gamma" | grep -o "[0-9].*"' % self.name
-        code, ret = _runProc(cmd)
+        _, ret = _RgetBrightnessAndGamma(self.name)
         if ret:
             try:
                 r, g, b = ret.split(":")
-                value = int((((1 / (float(r) or 1)) + (1 / (float(g) or 1)) + (1 / (float(b) or 1))) / 3) * 100)
-            except:
+                value = round((((1 / (float(r) or 1)) + (1 / (float(g) or 1)) + (1 / (float(b) or 1))) / 3) * 100)
+            except ValueError:
                 pass
         return value
 
+    def _getGamma(self) -> Optional[Tuple[float, Tuple[float, float, float]]]:
+        # Same values xrandr --verbose shows as Brightness and Gamma, but calculated from crtc gamma ramps,
+        # so no process needs to be spawned
+        ramps = self._getGammaRamps()
+        if ramps is not None:
+            return _XgetGammaValues(ramps[0], ramps[1], ramps[2])
+        return None
+
+    def _getGammaRamps(self) -> Optional[Tuple[List[int], List[int], List[int]]]:
+        monitorData = getMonitorsData(self.handle)
+        if monitorData:
+            display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData[0]
+            try:
+                ramps = randr.get_crtc_gamma(display, crtc)
+            except Xlib.error.XError:
+                return None
+            return ramps.red, ramps.green, ramps.blue
+        return None
+
     def setContrast(self, contrast: Optional[int]):
         if contrast is not None and 0<= contrast <= 100:
             value = contrast / 100
             if 0 <= value <= 1:
                 rgb = str(round(value, 1))
                 gamma = rgb + ":" + rgb + ":" + rgb
-                cmd = "xrandr --output %s --gamma %s" % (self.name, gamma)
+                cmd = ["xrandr", "--current", "--output", self.name, "--gamma", gamma]
                 _, _ = _runProc(cmd)
+                _RinvalidateBrightnessAndGamma()
 
     @property
     def mode(self) -> Optional[DisplayMode]:
         monitorData = getMonitorsData(self.handle)
         if monitorData:
             display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData[0]
-            for resMode in res.modes:
-                if resMode.id == crtcInfo.mode:
-                    if resMode.h_total != 0 and resMode.v_total != 0:
-                        freq = round(resMode.dot_clock / (resMode.h_total * resMode.v_total), 2)
-                    else:
-                        freq = 0.0
-                    return DisplayMode(resMode.width, resMode.height, freq)
+            return _XgetModes(res).byId.get(crtcInfo.mode)
         return None
 
     def setMode(self, mode: Optional[DisplayMode]):
         # https://stackoverflow.com/questions/12706631/x11-change-resolution-and-make-window-fullscreen
-        # randr.set_screen_size(defaultEwmhRoot.root, mode.width, mode.height, 0, 0)
-        # randr.set_screen_config(defaultEwmhRoot.root, size_id, 0, 0, round(mode.frequency), 0)
-        # randr.change_output_property()
         if mode:
-            cmd = "xrandr --output %s --mode %sx%s -r %s" % (self.name, mode.width, mode.height, mode.frequency)
-            _, _ = _runProc(cmd)
+            done = False
+            monitorData = getMonitorsData(self.handle)
+            if monitorData:
+                display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData[0]
+                modeId = _XgetModeId(res, outputInfo.modes, mode)
+                if modeId is not None and modeId == crtcInfo.mode:
+                    return
+                if modeId is not None:
+                    done = _XsetCrtcConfig(display, res, crtc, crtcInfo, mode=modeId)
+            if not done:
+                cmd = ["xrandr", "--current", "--output", self.name, "--mode", "%sx%s" % (mode.width, mode.height),
+                       "-r", str(mode.frequency)]
+                _, _ = _runProc(cmd)
+            _monitorCache.invalidate()
 
     @property
     def defaultMode(self) -> Optional[DisplayMode]:
@@ -488,19 +739,14 @@ class LinuxMonitor(BaseMonitor):
         monitorData = getMonitorsData(self.handle)
         if monitorData:
             display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData[0]
-            outMode = outputInfo.modes[0]
-            for resMode in res.modes:
-                if outMode == resMode.id:
-                    if resMode.h_total != 0 and resMode.v_total != 0:
-                        freq = round(resMode.dot_clock / (resMode.h_total * resMode.v_total), 2)
-                    else:
-                        freq = 0.0
-                    return DisplayMode(resMode.width, resMode.height, freq)
+            if outputInfo.modes:
+                return _XgetModes(res).byId.get(outputInfo.modes[0])
         return None
 
     def setDefaultMode(self):
-        cmd = "xrandr --output %s --auto" % self.name
+        cmd = ["xrandr", "--current", "--output", self.name, "--auto"]
         _, _ = _runProc(cmd)
+        _monitorCache.invalidate()
 
     @property
     def allModes(self) -> list[DisplayMode]:
@@ -508,19 +754,15 @@ class LinuxMonitor(BaseMonitor):
         monitorData = getMonitorsData(self.handle)
         if monitorData:
             display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData[0]
-            outputModes = outputInfo.modes
-            for resMode in res.modes:
-                if resMode.id in outputModes:
-                    if resMode.h_total != 0 and resMode.v_total != 0:
-                        freq = round(resMode.dot_clock / (resMode.h_total * resMode.v_total), 2)
-                    else:
-                        freq = 0.0
-                    modes.append(DisplayMode(resMode.width, resMode.height, freq))
+            outputModes = set(outputInfo.modes)
+            for modeId, mode in _XgetModes(res).byId.items():
+                if modeId in outputModes:
+                    modes.append(mode)
         return modes
 
     @property
     def isPrimary(self) -> bool:
-        if isWatchdogEnabled():
+        if isWatchdogEnabled() or _monitorCache.start():
             monitorData = getMonitorsData(self.handle)
             if monitorData:
                 display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData[0]
@@ -534,54 +776,70 @@ class LinuxMonitor(BaseMonitor):
     def setPrimary(self):
         # https://smithay.github.io/smithay////x11rb/protocol/randr/fn.set_monitor.html
         if not self.isPrimary:
-            cmd = "xrandr --output %s --primary" % self.name
+            cmd = ["xrandr", "--current", "--output", self.name, "--primary"]
             _, _ = _runProc(cmd)
+            _monitorCache.invalidate()
 
     def turnOn(self):
-        if self.isSuspended:
-            cmd = "xset dpms force on"
-            _, _ = _runProc(cmd)
-        if not self.isOn:
+        isSuspended = self.isSuspended
+        if isSuspended:
+            if not _XforceDpmsLevel(self.display, dpms.DPMSModeOn):
+                cmd = ["xset", "dpms", "force", "on"]
+                _, _ = _runProc(cmd)
+            isSuspended = False
+        if not self._isOn(isSuspended):
             targetX = 0
             targetName = ""
             for monitor in _XgetMonitors():
                 if self.name != monitor.name and targetX <= monitor.x + monitor.width_in_pixels:
                     targetX = monitor.x + monitor.width_in_pixels
                     targetName = monitor.name
-            cmdPart = ""
+            cmd = ["xrandr", "--current", "--output", self.name, "--auto"]
             if targetName:
-                cmdPart = " --right-of %s" % targetName
-            cmd = str("xrandr --output %s --auto" % self.name) + cmdPart
+                cmd += ["--right-of", targetName]
             _, _ = _runProc(cmd)
+            _monitorCache.invalidate()
 
     def turnOff(self):
         if self.isOn:
-            cmd = "xrandr --output %s --off" % self.name
+            cmd = ["xrandr", "--current", "--output", self.name, "--off"]
             _, _ = _runProc(cmd)
+            _monitorCache.invalidate()
 
     @property
     def isOn(self) -> Optional[bool]:
         # https://stackoverflow.com/questions/3433203/how-to-determine-if-lcd-monitor-is-turned-on-from-linux-command-line
-        cmd = "xrandr --listactivemonitors"
-        code, ret = _runProc(cmd)
-        res: Optional[bool] = None
-        if ret:
-            res = self.name in ret
-        isSuspended = self.isSuspended
+        return self._isOn(self.isSuspended)
+
+    def _isOn(self, isSuspended: Optional[bool]) -> Optional[bool]:
+        # Active monitors are the ones RandR returns (same as "xrandr --listactivemonitors", without spawning it)
+        # and their crtc must have a mode set
+        monitorData = getMonitorsData(self.handle)
+        res: Optional[bool] = bool(monitorData and monitorData[0].crtcInfo.mode)
         return (res and not isSuspended) if isSuspended is not None else res
 
     def suspend(self):
         # xrandr has no standby option. xset doesn't allow to target just one output (it works at display level)
         if not self.isSuspended:
-            cmd = "xset dpms force standby"
-            _, _ = _runProc(cmd)
+            if not _XforceDpmsLevel(self.display, dpms.DPMSModeStandby):
+                cmd = ["xset", "dpms", "force", "standby"]
+                _, _ = _runProc(cmd)
 
     @property
     def isSuspended(self) -> Optional[bool]:
-        cmd = 'xset -q | grep " Monitor is "'
+        # Same info "xset -q" shows (power level is only reported if DPMS is enabled), without spawning it
+        if self.display.has_extension(dpms.extname):
+            try:
+                info = self.display.dpms_info()
+                return bool(info.power_level == dpms.DPMSModeStandby) if info.state else None
+            except (Xlib.error.XError, AttributeError):
+                # AttributeError: DPMS methods are not added to the display if the extension is not initialized
+                pass
+        cmd = ["xset", "-q"]
         code, ret = _runProc(cmd)
-        if ret:
-            return bool("Standby" in ret)
+        for line in ret.split("\n"):
+            if " Monitor is " in line:
+                return bool("Standby" in line)
         return None
 
     def attach(self):
@@ -592,11 +850,11 @@ class LinuxMonitor(BaseMonitor):
             if self.name != monitor.name and targetX <= monitor.x + monitor.width_in_pixels:
                 targetX = monitor.x + monitor.width_in_pixels
                 targetName = monitor.name
-        cmdPart = ""
+        cmd = ["xrandr", "--current", "--output", self.name, "--auto"]
         if targetName:
-            cmdPart = " --right-of %s" % targetName
-        cmd = str("xrandr --output %s --auto" % self.name) + cmdPart
+            cmd += ["--right-of", targetName]
         _, _ = _runProc(cmd)
+        _monitorCache.invalidate()
 
     def detach(self, permanent: bool = False):
         # Setting mode to 0 produces the same effect that detaching a monitor.
@@ -606,35 +864,49 @@ class LinuxMonitor(BaseMonitor):
             try:
                 # randr.set_crtc_config() fails in Cinnamon
                 randr.set_crtc_config(self.display, crtc, Xlib.X.CurrentTime, crtcInfo.x, crtcInfo.y, 0, crtcInfo.rotation, [])
-            except:
-                cmd = "xrandr --output %s --mode %sx%s" % (self.name, 0, 0)
+            except Xlib.error.XError:
+                cmd = ["xrandr", "--current", "--output", self.name, "--mode", "0x0"]
                 _, _ = _runProc(cmd)
+            _monitorCache.invalidate()
 
     @property
     def isAttached(self) -> bool:
-        monitor = _XgetMonitors(self.name)
-        return bool(monitor)
+        return _XgetMonitor(self.name) is not None
 
 
-def _buildCommand(arrangement: dict[str, dict[str, Union[int, bool]]], xOffset: int, yOffset: int):
-    cmd = "xrandr"
-    for monName in arrangement.keys():
+def _XforceDpmsLevel(display: Xlib.display.Display, level: int) -> bool:
+    # As "xset dpms force", DPMS must be enabled before forcing any power level
+    if display.has_extension(dpms.extname):
+        try:
+            display.dpms_enable()
+            display.dpms_force_level(level)
+            display.sync()
+            return True
+        except (Xlib.error.XError, AttributeError):
+            # Same as in isSuspended
+            pass
+    return False
+
+
+def _buildCommand(arrangement: dict[str, dict[str, Union[int, bool]]], xOffset: int, yOffset: int) -> List[str]:
+    cmd = ["xrandr", "--current"]
+    for monName in arrangement:
         arrInfo = arrangement[monName]
-        cmd += " --output %s" % monName
+        cmd += ["--output", monName]
         # xrandr won't accept negative values!!!!
         # https://superuser.com/questions/485120/how-do-i-align-the-bottom-edges-of-two-monitors-with-xrandr
-        cmd += " --pos %sx%s" % (str(int(arrInfo["x"]) + xOffset), str(int(arrInfo["y"]) + yOffset))
-        cmd += " --mode %sx%s" % (arrInfo["w"], arrInfo["h"])
+        cmd += ["--pos", "%sx%s" % (str(int(arrInfo["x"]) + xOffset), str(int(arrInfo["y"]) + yOffset))]
+        cmd += ["--mode", "%sx%s" % (arrInfo["w"], arrInfo["h"])]
         if arrInfo["setPrimary"]:
-            cmd += " --primary"
+            cmd.append("--primary")
     return cmd
 
 
 def _GNOME_isScalingGlobal() -> Optional[bool]:
-    cmd = '''gsettings get org.gnome.mutter experimental-features'''
+    cmd = ["gsettings", "get", "org.gnome.mutter", "experimental-features"]
     try:
-        proc = subprocess.run(cmd, text=True, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if "wayland" in os.environ.get('XDG_SESSION_TYPE', '').lower():
+        proc = subprocess.run(cmd, text=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        if _isWayland:
             return bool("scale-monitor-framebuffer" not in proc.stdout)
         else:
             return bool("x11-randr-fractional-scaling" not in proc.stdout)
@@ -645,30 +917,33 @@ def _GNOME_isScalingGlobal() -> Optional[bool]:
 
 def _GNOME_setGlobalScaling(setGlobal=True):
     if setGlobal:
-        cmd = '''gsettings set org.gnome.mutter experimental-features "[]"'''
+        cmd: List[str] = ["gsettings", "set", "org.gnome.mutter", "experimental-features", "[]"]
         _, _ = _runProc(cmd)
     else:
-        cmd = ""
-        if "wayland" in os.environ.get('XDG_SESSION_TYPE', '').lower():
+        cmd = []
+        if _isWayland:
             try:
-                proc = subprocess.run("grep -sl mutter /proc/*/maps", text=True, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                # No shell to expand the wildcard, so files are listed here
+                import glob
+                proc = subprocess.run(["grep", "-sl", "mutter"] + glob.glob("/proc/*/maps"),
+                                      text=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
                 if "/maps" in proc.stdout:
-                    cmd = '''gsettings set org.gnome.mutter experimental-features "['scale-monitor-framebuffer']"'''
+                    cmd = ["gsettings", "set", "org.gnome.mutter", "experimental-features", "['scale-monitor-framebuffer']"]
             except:
                 pass
         else:
-            cmd = '''gsettings set org.gnome.mutter experimental-features "['x11-randr-fractional-scaling']"'''
+            cmd = ["gsettings", "set", "org.gnome.mutter", "experimental-features", "['x11-randr-fractional-scaling']"]
         if cmd:
             _, _ = _runProc(cmd)
   
                     
 def _GNOME_getScalingFactor() -> Optional[int]:
-    cmd = '''gsettings get org.gnome.settings-daemon.plugins.xsettings overrides'''
+    cmd = ["gsettings", "get", "org.gnome.settings-daemon.plugins.xsettings", "overrides"]
     code, ret = _runProc(cmd)
     if "WindowScalingFactor" in ret:
         try:
             return int(ret.split("WindowScalingFactor': <")[1][0])
-        except:
+        except (ValueError, IndexError):
             pass
     return None
 
@@ -772,48 +1047,70 @@ def _GNOME_getScalingFactor() -> Optional[int]:
 #     interface.ApplyMonitorsConfig(serial, 1, monConfig, {})
 
 
-def _scale(name: str) -> Optional[Tuple[float, float]]:
-    if "gnome" in os.environ.get('XDG_CURRENT_DESKTOP', '').lower() and _GNOME_isScalingGlobal():
-        value = _GNOME_getScalingFactor()
-        if value is not None:
-            scaleX, scaleY = value * 100.0, value * 100.0
-            return scaleX, scaleY
-
-    if "wayland" not in os.environ.get('XDG_SESSION_TYPE', '').lower():
-        value = None
-        cmd = 'xrandr -q | grep %s -A 5 | grep " +\\|*+"' % name
-        code, ret = _runProc(cmd)
-        if ret:
-            try:
-                res = ret.split(" ")
-                lines: List[str] = list(filter(None, res))
-                a, b = lines[0].split("x")
-                w = int(a)
-                h = int(b)
-                r = float(lines[1].replace("+", "").replace("*", ""))
-                value = DisplayMode(w, h, r)
-            except:
-                pass
+def _GNOME_getGlobalScale() -> Optional[float]:
+    # gsettings changes are not notified by X, so value is kept for a short time only (same than monitors cache
+    # when no RandR events are received), so reading several properties or monitors in a row spawns it just once
+    global _globalScale
+    global _globalScaleExpiry
+    if not _isGnome:
+        return None
+    now = time.monotonic()
+    if now >= _globalScaleExpiry:
+        _globalScale = None
+        if _GNOME_isScalingGlobal():
+            value = _GNOME_getScalingFactor()
+            if value is not None:
+                _globalScale = value * 100.0
+        _globalScaleExpiry = now + _noEventsTTL
+    return _globalScale
+
+
+_globalScale: Optional[float] = None
+_globalScaleExpiry = 0.0
+
+
+def _XgetScale(monitor: randr.MonitorInfo, outputInfo: randr.GetOutputInfo,
+               modes: dict[int, DisplayMode]) -> Optional[Tuple[float, float]]:
+    # Scale is calculated comparing current size with preferred mode size (the one xrandr marks with '+')
+    if not _isWayland and outputInfo.num_preferred and outputInfo.modes:
+        value = modes.get(outputInfo.modes[0])
         if value:
-            monitors = _XgetMonitors(name)
-            if monitors:
-                monitor = monitors[0]
-                w, h = monitor.width_in_pixels, monitor.height_in_pixels
-                wm, hm = monitor.width_in_millimeters, monitor.height_in_millimeters
-                if wm and hm:
-                    wDef, hDef = value.width, value.height
-                    dpiXDef, dpiYDef = round((wDef * 25.4) / wm), round((hDef * 25.4) / hm)
-                    dpiX, dpiY = round((w * 25.4) / wm), round((h * 25.4) / hm)
-                    if dpiX and dpiY and dpiXDef and dpiYDef:
-                        scaleX, scaleY = (100 / (dpiX / dpiXDef), 100 / (dpiY / dpiYDef))
-                        return scaleX, scaleY
+            dpiXDef, dpiYDef = _getDpi(monitor, outputInfo, value.width, value.height)
+            dpiX, dpiY = _getDpi(monitor, outputInfo)
+            if dpiX and dpiY and dpiXDef and dpiYDef:
+                scaleX, scaleY = (100 / (dpiX / dpiXDef), 100 / (dpiY / dpiYDef))
+                return scaleX, scaleY
     return None
 
 
-def _runProc(cmd: str):
+def _getDpi(monitor: randr.MonitorInfo, outputInfo: randr.GetOutputInfo,
+            width: Optional[int] = None, height: Optional[int] = None) -> Tuple[float, float]:
+    # Physical size is taken from output info if monitor doesn't report it (0 when both are unknown)
+    wm = monitor.width_in_millimeters or getattr(outputInfo, "mm_width", 0)
+    hm = monitor.height_in_millimeters or getattr(outputInfo, "mm_height", 0)
+    if not wm or not hm:
+        return 0.0, 0.0
+    w = monitor.width_in_pixels if width is None else width
+    h = monitor.height_in_pixels if height is None else height
+    return round((w * 25.4) / wm), round((h * 25.4) / hm)
+
+
+def _scale(handle: int) -> Optional[Tuple[float, float]]:
+    globalScale = _GNOME_getGlobalScale()
+    if globalScale is not None:
+        return globalScale, globalScale
+    monitorData = getMonitorsData(handle)
+    if monitorData:
+        display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData[0]
+        return _XgetScale(monitor, outputInfo, _XgetModes(res).byId)
+    return None
+
+
+def _runProc(cmd: List[str]):
     try:
         # Some commands will take some time to be executed and return required value
-        proc = subprocess.run(cmd, text=True, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE) #, timeout=3)
+        # Arguments are passed as a list, so no shell is spawned and names are never parsed by it
+        proc = subprocess.run(cmd, text=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) #, timeout=3)
         return proc.returncode, proc.stdout
     except:
         pass
@@ -832,127 +1129,359 @@ class _Monitor(NamedTuple):
     crtcs: List[int]
 
 
-def _getMonitorsData(handle: Optional[int] = None) -> (
-                        List[Tuple[Xlib.display.Display, Struct, XWindow, randr.GetScreenResourcesCurrent,
-                        randr.MonitorInfo, str, int, randr.GetOutputInfo, int, randr.GetCrtcInfo]]):
-    monitors: List[Tuple[Xlib.display.Display, Struct, XWindow, randr.GetScreenResourcesCurrent,
-                         randr.MonitorInfo, str, int, randr.GetOutputInfo, int, randr.GetCrtcInfo]] = []
+class _MonitorData(NamedTuple):
+    display: Xlib.display.Display
+    screen: Struct
+    root: XWindow
+    res: randr.GetScreenResourcesCurrent
+    monitor: Union[randr.MonitorInfo, _Monitor]
+    monName: str
+    output: int
+    outputInfo: randr.GetOutputInfo
+    crtc: int
+    crtcInfo: randr.GetCrtcInfo
+
+
+def _getMonitorsData(handle: Optional[int] = None) -> List[_MonitorData]:
+    return _monitorCache.getMonitorsData(handle)
+
+
+def _XqueryMonitorsData() -> List[_MonitorData]:
+    _checkEnvironment()
+    monitors: List[_MonitorData] = []
     stopSearching = False
-    roots: List[Tuple[Xlib.display.Display, Struct, XWindow]] = getRoots()
-    for rootData in roots:
-        display, screen, root = rootData
+    # Monitors and screen resources of all roots are requested before waiting for any reply, so all displays (and
+    # screens) are queried at the same time, instead of one after another
+    requests = []
+    for display, screen, root in _getRoots():
         try:
-            mons = randr.get_monitors(root).monitors
+            monsRequest = _XsendRequest(randr.GetMonitors, display, window=root, is_active=True)
+            resRequest = _XsendRequest(randr.GetScreenResourcesCurrent, display, window=root)
+        except Xlib.error.ConnectionClosedError:
+            if not _XdropDisplay(display):
+                raise
+            continue
         except:
-            # In Cinnamon randr extension has no get_monitors() method (?!?!?!?)
+            # Requests could not be sent, so this root is managed below as if they had failed
+            monsRequest = resRequest = None
+        requests.append((display, screen, root, monsRequest, resRequest))
+    for display, screen, root, monsRequest, res in requests:
+        if monsRequest is not None:
+            try:
+                monsRequest.reply()
+            except Xlib.error.ConnectionClosedError:
+                if not _XdropDisplay(display):
+                    raise
+                continue
+            except:
+                # In Cinnamon randr extension has no get_monitors() method (?!?!?!?)
+                monsRequest = None
+        if monsRequest is None:
             mons = _RgetAllMonitors()
             stopSearching = True
-        for monitor in mons:
-            if isinstance(monitor.name, int):
-                monitor.name = display.get_atom_name(monitor.name)
-            res = randr.get_screen_resources_current(root)
-            output = monitor.crtcs[0]
-            outputInfo = randr.get_output_info(display, output, res.config_timestamp)
-            if outputInfo.crtc:
-                if handle:
-                    if handle == output:
-                        crtcInfo = randr.get_crtc_info(display, outputInfo.crtc, res.config_timestamp)
-                        return [(display, screen, root, res, monitor, monitor.name, output, outputInfo, outputInfo.crtc, crtcInfo)]
-                else:
-                    crtcInfo = randr.get_crtc_info(display, outputInfo.crtc, res.config_timestamp)
-                    monitors.append((display, screen, root, res, monitor, monitor.name, output, outputInfo, outputInfo.crtc, crtcInfo))
+        else:
+            mons = monsRequest.monitors
+        if mons:
+            if res is None:
+                res = randr.get_screen_resources_current(root)
+            else:
+                res.reply()
+            outputInfos = _XgetOutputsInfo(display, [monitor.crtcs[0] for monitor in mons], res.config_timestamp)
+            crtcInfos = [_XsendRequest(randr.GetCrtcInfo, display, crtc=outputInfo.crtc,
+                                       config_timestamp=res.config_timestamp)
+                         if outputInfo.crtc else None
+                         for outputInfo in outputInfos]
+            for monitor, outputInfo, crtcInfo in zip(mons, outputInfos, crtcInfos):
+                if crtcInfo is not None:
+                    crtcInfo.reply()
+                    if isinstance(monitor.name, int):
+                        monitor.name = _XgetAtomName(display, monitor.name)
+                    monitors.append(_MonitorData(display, screen, root, res, monitor, monitor.name, monitor.crtcs[0],
+                                                 outputInfo, outputInfo.crtc, crtcInfo))
         if stopSearching:
             break
     return monitors
 
 
+def _XopenDisplay(name: str) -> Optional[Xlib.display.Display]:
+    try:
+        return Xlib.display.Display(name)
+    except (Xlib.error.DisplayError, Xlib.error.ConnectionClosedError, OSError):
+        return None
+
+
+def _XsendRequest(request: Any, display: Xlib.display.Display, **fields: Any) -> Any:
+    # RandR request is sent without waiting for its reply (got later, calling its reply() method). Sending all the
+    # requests needed before reading any reply takes a single round trip to the server, instead of one per request
+    return request(display=display.display, opcode=display.display.get_extension_major(randr.extname), defer=True,
+                   **fields)
+
+
+def _XgetOutputsInfo(display: Xlib.display.Display, outputs: List[int], configTimestamp: int) -> List[randr.GetOutputInfo]:
+    outputsInfo = [_XsendRequest(randr.GetOutputInfo, display, output=output, config_timestamp=configTimestamp)
+                   for output in outputs]
+    for outputInfo in outputsInfo:
+        outputInfo.reply()
+    return outputsInfo
+
+
+def _XgetDisplays() -> List[Xlib.display.Display]:
+    # Only current display ($DISPLAY) is used, unless all local X servers are explicitly requested
+    if os.environ.get("PYMONCTL_ALL_DISPLAYS", "") != "1":
+        return [defaultEwmhRoot.display]
+    names: List[str] = []
+    defaultName = defaultEwmhRoot.display.get_display_name().split(".")[0]
+    try:
+        with os.scandir("/tmp/.X11-unix") as entries:
+            for entry in entries:
+                # Only X server sockets (skipping lock files like ".X0-lock" and any other non-socket entry)
+                if entry.name[:1] == "X" and entry.is_socket():
+                    names.append(":" + entry.name[1:])
+    except OSError:
+        # /tmp/.X11-unix may not exist (e.g. remote or TCP-only displays)
+        pass
+    otherNames = [name for name in names if name != defaultName]
+    if len(otherNames) > 1:
+        # Each connection handshake waits for its own server, so they are opened in parallel
+        # (only needed when several displays are requested, so it is not imported by default)
+        import concurrent.futures
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(otherNames)) as executor:
+            opened = dict(zip(otherNames, executor.map(_XopenDisplay, otherNames)))
+    else:
+        opened = {name: _XopenDisplay(name) for name in otherNames}
+    displays: List[Xlib.display.Display] = []
+    for name in names:
+        display = defaultEwmhRoot.display if name == defaultName else opened.get(name)
+        if display is not None:
+            displays.append(display)
+    if defaultEwmhRoot.display not in displays:
+        displays.insert(0, defaultEwmhRoot.display)
+    return displays
+
+
+def _XgetRoots() -> List[Tuple[Xlib.display.Display, Struct, XWindow]]:
+    roots: List[Tuple[Xlib.display.Display, Struct, XWindow]] = []
+    for display in _getDisplays():
+        for i in range(display.screen_count()):
+            screen = display.screen(i)
+            roots.append((display, screen, screen.root))
+    return roots
+
+
+def _XdropDisplay(display: Xlib.display.Display) -> bool:
+    # Connection to this display has been lost (X server stopped), so it is removed from the cached displays
+    if display is defaultEwmhRoot.display:
+        # Nothing to do if the default display is lost
+        return False
+    global _displays
+    global _roots
+    with _displaysLock:
+        if _displays is not None and display in _displays:
+            _displays = [d for d in _displays if d is not display]
+            _roots = None
+            # Atoms are only valid for the server they were got from, and id() may be reused by a new connection
+            displayId = id(display)
+            for atomKey in [atomKey for atomKey in _atomNames if atomKey[0] == displayId]:
+                _atomNames.pop(atomKey, None)
+            for nameKey in [nameKey for nameKey in _atoms if nameKey[0] == displayId]:
+                _atoms.pop(nameKey, None)
+    return True
+
+
+def _getDisplays() -> List[Xlib.display.Display]:
+    # Displays are opened on first use instead of on import, so importing the module doesn't need to scan them
+    global _displays
+    displays = _displays
+    if displays is None:
+        with _displaysLock:
+            if _displays is None:
+                _displays = _XgetDisplays()
+            displays = _displays
+    return displays
+
+
+def _getRoots() -> List[Tuple[Xlib.display.Display, Struct, XWindow]]:
+    global _roots
+    roots = _roots
+    if roots is None:
+        roots = _XgetRoots()
+        _roots = roots
+    return roots
+
+
+def _XcloseDisplays():
+    # Default display is owned by ewmhlib, so only the connections opened by this module are closed
+    with _displaysLock:
+        for display in _displays or []:
+            if display is not defaultEwmhRoot.display:
+                try:
+                    display.close()
+                except:
+                    pass
+
+
+_displaysLock = threading.Lock()
+_displays: Optional[List[Xlib.display.Display]] = None
+_roots: Optional[List[Tuple[Xlib.display.Display, Struct, XWindow]]] = None
+atexit.register(_XcloseDisplays)
+_atomNames: dict[Tuple[int, int], str] = {}
+_atoms: dict[Tuple[int, str], int] = {}
+
+
+def _XgetAtomName(display: Xlib.display.Display, atom: int) -> str:
+    # Atoms will not change during the display connection lifetime, so each one is requested only once
+    key = (id(display), atom)
+    name = _atomNames.get(key)
+    if name is None:
+        name = display.get_atom_name(atom)
+        _atomNames[key] = name
+        _atoms[(id(display), name)] = atom
+    return name
+
+
+def _XgetAtom(display: Xlib.display.Display, name: str) -> int:
+    # Same as above, in the opposite direction (name to atom)
+    key = (id(display), name)
+    atom = _atoms.get(key)
+    if atom is None:
+        atom = display.get_atom(name)
+        _atoms[key] = atom
+        _atomNames[(id(display), atom)] = name
+    return atom
+
+
 def _XgetAllMonitors(name: str = ""):
+    _checkEnvironment()
     monitors = []
     if isWatchdogEnabled():
         for monitorData in getMonitorsData():
             display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData
             if name:
-                if name and name == monName:
+                if name == monName:
                     return [(display, screen, root, monitor, monName)]
             else:
                 monitors.append((display, screen, root, monitor, monName))
+    elif name:
+        # Names are unique, so no need to go through all monitors
+        monitorData = _monitorCache.getMonitorByName(name)
+        if monitorData is not None:
+            display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData
+            return [(display, screen, root, monitor, monName)]
     else:
-        stopSearching = False
-        roots: List[Tuple[Xlib.display.Display, Struct, XWindow]] = getRoots()
-        for rootData in roots:
-            display, screen, root = rootData
-            try:
-                mons = randr.get_monitors(root).monitors
-            except:
-                # In Cinnamon randr extension has no get_monitors() method (?!?!?!?)
-                mons = _RgetAllMonitors()
-                stopSearching = True
-            for monitor in mons:
-                if isinstance(monitor.name, int):
-                    monitor.name = display.get_atom_name(monitor.name)
-                if name:
-                    if name == monitor.name:
-                        return [(display, screen, root, monitor, monitor.name)]
-                else:
-                    monitors.append((display, screen, root, monitor, monitor.name))
-            if stopSearching:
-                break
+        for monitorData in _monitorCache.getMonitorsData():
+            display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData
+            monitors.append((display, screen, root, monitor, monName))
     return monitors
 
 
 def _RgetAllMonitors():
-    # Check if this works in actual Cinnamon
+    # Used when randr has no get_monitors() method (e.g. Cinnamon): monitors are built from active outputs and their
+    # crtcs, the same way xrandr does, so no process needs to be spawned
     monitors: List[_Monitor] = []
-    outputDict = {}
-    for outputData in _XgetAllOutputs():
-        display, screen, root, output, outputInfo = outputData
-        outputDict[outputInfo.name] = {"outputData": outputData}
-
-    namesData = _RgetMonitorsInfo()
-    for item in namesData:
-        monName, primary, x, y, w, h = item
-        if monName in outputDict.keys():
-            display, screen, root, output, outputInfo = outputDict[monName]["outputData"]
-            wm, hm = outputInfo.mm_width, outputInfo.mm_height
-            crtcs = [output]
-            monitors.append(_Monitor(monName, primary, x, y, w, h, wm, hm, crtcs))
+    primaries: dict[int, int] = {}
+    active = []
+    for display, screen, root, output, outputInfo in _XgetAllOutputs():
+        if outputInfo.connection != randr.Connected or not outputInfo.crtc:
+            continue
+        if root.id not in primaries:
+            try:
+                primaries[root.id] = randr.get_output_primary(root).output
+            except Xlib.error.XError:
+                primaries[root.id] = 0
+        crtcInfo = _XsendRequest(randr.GetCrtcInfo, display, crtc=outputInfo.crtc, config_timestamp=Xlib.X.CurrentTime)
+        active.append((root, output, outputInfo, crtcInfo))
+    for root, output, outputInfo, crtcInfo in active:
+        try:
+            crtcInfo.reply()
+        except Xlib.error.XError:
+            continue
+        if crtcInfo.mode:
+            primary = 1 if primaries[root.id] == output else 0
+            monitors.append(_Monitor(outputInfo.name, primary, crtcInfo.x, crtcInfo.y, crtcInfo.width, crtcInfo.height,
+                                     outputInfo.mm_width, outputInfo.mm_height, [output]))
     return monitors
 
 
+def _RgetBrightnessAndGamma(name: str) -> Tuple[Optional[str], Optional[str]]:
+    # Just one xrandr process (no shell nor grep pipelines) for all outputs. Output is parsed here and kept for
+    # a short time, so reading brightness and contrast (or several monitors) in a row doesn't spawn it again
+    global _verboseInfo
+    global _verboseExpiry
+    now = time.monotonic()
+    if now >= _verboseExpiry:
+        try:
+            proc = subprocess.run(["xrandr", "--current", "--verbose"], text=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except (OSError, subprocess.SubprocessError):
+            return None, None
+        _verboseInfo = _RparseVerbose(proc.stdout)
+        _verboseExpiry = now + _verboseTTL
+    return _verboseInfo.get(name, (None, None))
+
+
+def _RparseVerbose(output: str) -> dict[str, Tuple[Optional[str], Optional[str]]]:
+    info: dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    name = ""
+    brightness: Optional[str] = None
+    gamma: Optional[str] = None
+    for line in output.split("\n"):
+        if line and not line[0].isspace():
+            # Output (or screen) header: properties of previous output (if any) are complete
+            if name:
+                info[name] = (brightness, gamma)
+            name = line.split(" ", 1)[0] if " connected" in line or " disconnected" in line else ""
+            brightness = gamma = None
+        elif name:
+            item = line.strip()
+            if item.startswith("Brightness:"):
+                brightness = item.split(":", 1)[1].strip()
+            elif item.startswith("Gamma:"):
+                gamma = item.split(":", 1)[1].strip()
+    if name:
+        info[name] = (brightness, gamma)
+    return info
+
+
+def _RinvalidateBrightnessAndGamma():
+    global _verboseExpiry
+    _verboseExpiry = 0.0
+
+
+_verboseTTL = 0.2
+_verboseInfo: dict[str, Tuple[Optional[str], Optional[str]]] = {}
+_verboseExpiry = 0.0
+
+
 def _RgetMonitorsInfo(activeOnly: bool = True):
     monInfo = []
-    cmd = "xrandr -q | grep %s" % ("' connected '" if activeOnly else "'connected '")
+    cmd = ["xrandr", "--current"]
     code, ret = _runProc(cmd)
     if ret:
-        try:
-            lines = ret.split("\n")[:-1]
-            for line in lines:
-                items = line.split(" ")
-                name = items[0]
-                if name:
-                    primary = 1 if "primary" in items[2] else 0
-                    info = items[2 + primary]
-                    if "x" in info and "+" in info:
-                        parts = info.split("+")
-                        x = parts[1]
-                        y = parts[2]
-                        w, h = parts[0].split("x")
-                        monInfo.append((name, primary, int(x), int(y), int(w), int(h)))
-        except:
-            pass
+        pattern = _xrandrActiveRe if activeOnly else _xrandrOutputRe
+        for match in pattern.finditer(ret):
+            name, primary, w, h, x, y = match.groups()
+            monInfo.append((name, 1 if primary else 0, int(x), int(y), int(w), int(h)))
     return monInfo
 
 
+# Output lines with geometry, as in: "HDMI-1 connected primary 1920x1080+0+0 (normal left inverted...) 527mm x 296mm"
+_xrandrActiveRe = re.compile(r"^(\S+) connected (primary )?(\d+)x(\d+)\+(-?\d+)\+(-?\d+)", re.M)
+_xrandrOutputRe = re.compile(r"^(\S+) (?:dis)?connected (primary )?(\d+)x(\d+)\+(-?\d+)\+(-?\d+)", re.M)
+
+
 def _XgetAllOutputs(name: str = ""):
+    _checkEnvironment()
     outputs: List[Tuple[Xlib.display.Display, Xlib.protocol.rq.Struct, Xlib.xobject.drawable.Window,
                         int, randr.GetOutputInfo]] = []
-    roots: List[Tuple[Xlib.display.Display, Struct, XWindow]] = getRoots()
-    for rootData in roots:
+    for rootData in _getRoots():
         display, screen, root = rootData
-        res = randr.get_screen_resources_current(root)
-        for output in res.outputs:
-            outputInfo = randr.get_output_info(display, output, res.config_timestamp)
-            if os.environ.get('DESKTOP_SESSION', "").lower() == "cinnamon" and outputInfo.name.startswith("ual"):
+        try:
+            res = randr.get_screen_resources_current(root)
+        except Xlib.error.ConnectionClosedError:
+            if not _XdropDisplay(display):
+                raise
+            continue
+        for output, outputInfo in zip(res.outputs, _XgetOutputsInfo(display, res.outputs, res.config_timestamp)):
+            if _isCinnamon and outputInfo.name.startswith("ual"):
                 outputInfo.name = _fixCinnamonName(outputInfo.name)
             if name:
                 if name == outputInfo.name and outputInfo.crtc:
@@ -962,19 +1491,24 @@ def _XgetAllOutputs(name: str = ""):
     return outputs
 
 
-_cinnamon_names = []
-if os.environ.get('DESKTOP_SESSION', "").lower() == "cinnamon":
-    _cinnamon_names = [item[0] for item in _RgetMonitorsInfo(False)]
+# xrandr output names (only needed, and retrieved on first use, in Cinnamon)
+_cinnamon_names: Optional[List[str]] = None
+_cinnamon_fixed_names: dict[str, str] = {}
 
 
 def _fixCinnamonName(outputName: str):
     # in Cinnamon VMs, output.name seems to be cut to the last 4 chars
-    outName = outputName
     global _cinnamon_names
-    for name in _cinnamon_names:
-        if name.endswith(outputName):
-            outName = name
-            break
+    outName = _cinnamon_fixed_names.get(outputName)
+    if outName is None:
+        if _cinnamon_names is None:
+            _cinnamon_names = [item[0] for item in _RgetMonitorsInfo(False)]
+        outName = outputName
+        for name in _cinnamon_names:
+            if name.endswith(outputName):
+                outName = name
+                break
+        _cinnamon_fixed_names[outputName] = outName
     return outName
 
 
@@ -986,6 +1520,16 @@ def _XgetMonitors(name: str = ""):
     return monitors
 
 
+def _XgetMonitor(name: str) -> Any:
+    # Single monitor by name, without building any intermediate list (names are unique)
+    if isWatchdogEnabled():
+        monitors = _XgetAllMonitors(name)
+        return monitors[0][3] if monitors else None
+    _checkEnvironment()
+    monitorData = _monitorCache.getMonitorByName(name)
+    return monitorData.monitor if monitorData is not None else None
+
+
 def _XgetMonitorsDict():
     monitors = {}
     for monitorData in _XgetAllMonitors():
@@ -994,86 +1538,279 @@ def _XgetMonitorsDict():
     return monitors
 
 
-def _XgetMonitorData(handle: Optional[int] = None) -> Optional[Tuple[Xlib.display.Display, Struct, XWindow, randr.MonitorInfo, int, str]]:
-    for monitorData in _XgetAllMonitors():
-        display, screen, root, monitor, monName = monitorData
-        output = monitor.crtcs[0]
-        if (handle and handle == output) or (not handle and monitor.primary == 1):
+def _XgetMonitorData(handle: Optional[int] = None) -> (
+                        Optional[Tuple[Xlib.display.Display, Struct, XWindow, Union[randr.MonitorInfo, _Monitor], int, str]]):
+    # Monitors data already has all needed info: watchdog's (scanning its list for the handle) if it is running,
+    # or monitors cache's (looking the handle up in its index) otherwise
+    for monitorData in getMonitorsData(handle):
+        display, screen, root, res, monitor, monName, output, outputInfo, crtc, crtcInfo = monitorData
+        if handle or monitor.primary == 1:
             return display, screen, root, monitor, output, monName
     return None
 
 
+class _MonitorCache:
+
+    def __init__(self):
+        # Monitors info is kept until RandR notifies a change (only while the events listener is running)
+        self._lock = threading.Lock()
+        self._kill = threading.Event()
+        self._listener: Optional[threading.Thread] = None
+        self._listenerFailed = False
+        self._wakeupRecv: Optional[socket.socket] = None
+        self._wakeupSend: Optional[socket.socket] = None
+        self._dirty = True
+        self._monitorsData: List[_MonitorData] = []
+        # Monitors boxes as (left, top, right, bottom, monitorData), sorted by left edge, to quickly find which
+        # monitors contain a given point
+        self._boxes: Tuple[Tuple[int, int, int, int, _MonitorData], ...] = ()
+        self._byHandle: dict[int, _MonitorData] = {}
+        self._byName: dict[str, _MonitorData] = {}
+        # WORKAREA is not related to RandR, so it is kept apart, and only for a short time (its changes are not
+        # notified by RandR, and root property events would wake the listener up on any root property change)
+        self._workAreas: dict[Tuple[int, int], Optional[List[int]]] = {}
+        self._workAreasExpiry = 0.0
+        # If events can't be received, changes will not be noticed, so info is only kept for a short time
+        self._expiry = 0.0
+        # Increased every time cached monitors info is refreshed
+        self._generation = 0
+
+    def start(self) -> bool:
+        if self._listener is None and not self._listenerFailed:
+            with self._lock:
+                if self._listener is None and not self._listenerFailed:
+                    self._startListener()
+        return self._listener is not None and self._listener.is_alive()
+
+    def _startListener(self):
+        # Events are read using separate connections, so waiting for them never blocks the requests sent by other threads
+        eventDisplays: List[Xlib.display.Display] = []
+        try:
+            for display in _getDisplays():
+                eventDisplay = Xlib.display.Display(display.get_display_name())
+                # Added right away, so it is closed too if anything below fails
+                eventDisplays.append(eventDisplay)
+                for i in range(eventDisplay.screen_count()):
+                    randr.select_input(eventDisplay.screen(i).root,
+                                       randr.RRScreenChangeNotifyMask
+                                       | randr.RRCrtcChangeNotifyMask
+                                       | randr.RROutputChangeNotifyMask
+                                       )
+                # Input selection must reach the server before cached info can be trusted
+                eventDisplay.sync()
+        except (Xlib.error.DisplayError, Xlib.error.ConnectionClosedError, Xlib.error.XError, OSError):
+            for eventDisplay in eventDisplays:
+                eventDisplay.close()
+            self._listenerFailed = True
+            return
+        self._wakeupRecv, self._wakeupSend = socket.socketpair()
+        self._wakeupRecv.setblocking(False)
+        self._listener = threading.Thread(target=_eventLoop, args=(self._kill, self._wakeupRecv, eventDisplays,
+                                                                   self._onEvent))
+        self._listener.daemon = True
+        self._listener.start()
+
+    def stop(self):
+        if self._listener is not None and self._listener.is_alive():
+            self._kill.set()
+            wakeupSend = self._wakeupSend
+            if wakeupSend is not None:
+                try:
+                    wakeupSend.send(b"\x00")
+                except OSError:
+                    pass
+            self._listener.join(1)
+            if wakeupSend is not None:
+                wakeupSend.close()
+
+    def invalidate(self):
+        self._dirty = True
+        # Work areas will likely change too when monitors do
+        self._workAreasExpiry = 0.0
+
+    def getGeneration(self) -> Optional[int]:
+        # None if changes can't be noticed (events listener not running), so generation can't be trusted
+        if self._listener is not None and self._listener.is_alive():
+            return self._generation
+        return None
+
+    def getWorkArea(self, display: Xlib.display.Display, root: XWindow) -> Optional[List[int]]:
+        # Caller must check the cache is active (start() returned True) before using this
+        now = time.monotonic()
+        if now >= self._workAreasExpiry:
+            self._workAreas = {}
+            self._workAreasExpiry = now + _noEventsTTL
+        workAreas = self._workAreas
+        key = (id(display), root.id)
+        if key in workAreas:
+            return workAreas[key]
+        wa = _XqueryWorkArea(display, root)
+        workAreas[key] = wa
+        return wa
+
+    @staticmethod
+    def _onEvent(eventName: str, event: Any):
+        # Watchdog (if running) doesn't need to wait until its next poll to notice monitors have changed
+        _wakeupUpdateScreens()
+
+    def _current(self) -> List[_MonitorData]:
+        if self.start():
+            return self._update()
+        now = time.monotonic()
+        if now >= self._expiry:
+            self._dirty = True
+        monitorsData = self._update()
+        if self._expiry <= now:
+            self._expiry = now + _noEventsTTL
+        return monitorsData
+
+    def getMonitorsData(self, handle: Optional[int] = None) -> List[_MonitorData]:
+        monitorsData = self._current()
+        if handle:
+            monitorData = self._byHandle.get(handle)
+            return [monitorData] if monitorData is not None else []
+        return list(monitorsData)
+
+    def getMonitorsCount(self) -> int:
+        # Same as above, no need to copy the cached list just to count it
+        return len(self._current())
+
+    def getMonitorByName(self, name: str) -> Optional[_MonitorData]:
+        self._current()
+        return self._byName.get(name)
+
+    def findMonitors(self, x: int, y: int) -> List[_MonitorData]:
+        self._current()
+        found: List[_MonitorData] = []
+        for left, top, right, bottom, monitorData in self._boxes:
+            if left > x:
+                # Boxes are sorted by left edge, so none of the remaining ones can contain the point
+                break
+            if x <= right and top <= y <= bottom:
+                found.append(monitorData)
+        return found
+
+    def _update(self) -> List[_MonitorData]:
+        with self._lock:
+            if self._dirty:
+                # Flag is cleared before querying, so changes notified in the meantime will force a new query
+                self._dirty = False
+                try:
+                    self._monitorsData = _XqueryMonitorsData()
+                except:
+                    self._dirty = True
+                    raise
+                self._boxes = tuple((monitorData.monitor.x, monitorData.monitor.y,
+                                     monitorData.monitor.x + monitorData.monitor.width_in_pixels,
+                                     monitorData.monitor.y + monitorData.monitor.height_in_pixels,
+                                     monitorData)
+                                    for monitorData in sorted(self._monitorsData, key=lambda m: m.monitor.x))
+                self._byHandle = {monitorData.output: monitorData for monitorData in self._monitorsData}
+                self._byName = {monitorData.monName: monitorData for monitorData in self._monitorsData}
+                self._generation += 1
+            return self._monitorsData
+
+
+_noEventsTTL = 0.5
+_monitorCache = _MonitorCache()
+atexit.register(_monitorCache.stop)
+
+
+_environmentChecked = False
+
+
 def _checkEnvironment():
+    # Checked on first query instead of on import, so importing the module doesn't need to query the X server
+    global _environmentChecked
+    if _environmentChecked:
+        return
+    _environmentChecked = True
 
     # Check if randr extension is available
+    # has_extension() uses the extensions list got when connecting, so the server is only queried if it fails
     if not defaultEwmhRoot.display.has_extension('RANDR'):
         sys.stderr.write('{}: server does not have the RANDR extension\n'.format(sys.argv[0]))
         ext = defaultEwmhRoot.display.query_extension('RANDR')
-        print(ext)
-        sys.stderr.write("\n".join(defaultEwmhRoot.display.list_extensions()))
         if ext is None:
+            sys.stderr.write("\n".join(defaultEwmhRoot.display.list_extensions()) + "\n")
             sys.exit(1)
 
-    # Check if Xorg is running and xset is present (this will not work on Wayland or alike)
-    cmd = "xset -q"
-    code, ret = _runProc(cmd)
-    if not ret:
+    # X server is already known to be running (and have RandR), so just look for the tools in PATH, without running
+    # them (running "xrandr" may force the server to probe all outputs, which can take long on some drivers)
+    # xset is only needed if server has no DPMS extension
+    if not defaultEwmhRoot.display.has_extension(dpms.extname) and shutil.which("xset") is None:
         sys.stderr.write("{}: xset is not available. 'suspend' and 'isSuspended' methods will not work\n".format(sys.argv[0]))
 
     # Check if xrandr is present (it will not in distributions like Arch or Manjaro)
-    cmd = "xrandr -q"
-    code, ret = _runProc(cmd)
-    if not ret:
+    if shutil.which("xrandr") is None:
         sys.stderr.write(
             '{}: Xorg and/or xrandr are not available\n'.format(sys.argv[0]))
         sys.exit(1)
-_checkEnvironment()
-
-
-def _eventLoop(kill: threading.Event, interval: float):
-
-    randr.select_input(defaultEwmhRoot.root,
-                       randr.RRScreenChangeNotifyMask
-                       | randr.RRCrtcChangeNotifyMask
-                       | randr.RROutputChangeNotifyMask
-                       | randr.RROutputPropertyNotifyMask
-    )
 
-    while not kill.is_set():
 
-        count = defaultEwmhRoot.display.pending_events()
-        while count > 0 and not kill.is_set():
+def _eventLoop(kill: threading.Event, wakeup: socket.socket, displays: List[Xlib.display.Display],
+               callback: Optional[Callable[[str, Any], None]] = None):
 
-            e = defaultEwmhRoot.display.next_event()
+    # Waiting on display connections (instead of polling them every interval) gets changes as soon as they are
+    # notified, and keeps the thread idle otherwise. Wakeup socket allows to stop it at any moment
+    selector = selectors.DefaultSelector()
+    selector.register(wakeup, selectors.EVENT_READ)
+    for display in displays:
+        selector.register(display.fileno(), selectors.EVENT_READ)
 
-            if e.__class__.__name__ == randr.ScreenChangeNotify.__name__:
-                print('Screen change')
-                print(e._data)
-
-            # check if we're getting one of the RandR event types with subcodes
-            elif e.type == defaultEwmhRoot.display.extension_event.CrtcChangeNotify[0]:
-                # yes, check the subcodes
-
-                # CRTC information has changed
-                if (e.type, e.sub_code) == defaultEwmhRoot.display.extension_event.CrtcChangeNotify:
-                    print('CRTC change')
-                    # e = randr.CrtcChangeNotify(display=display.display, binarydata = e._binary)
-                    print(e._data)
-
-                # Output information has changed
-                elif (e.type, e.sub_code) == defaultEwmhRoot.display.extension_event.OutputChangeNotify:
-                    print('Output change')
-                    # e = randr.OutputChangeNotify(display=display.display, binarydata = e._binary)
-                    print(e._data)
-
-                # Output property information has changed
-                elif (e.type, e.sub_code) == defaultEwmhRoot.display.extension_event.OutputPropertyNotify:
-                    print('Output property change')
-                    # e = randr.OutputPropertyNotify(display=display.display, binarydata = e._binary)
-                    print(e._data)
-
-                else:
-                    print("Unrecognised subcode", e.sub_code)
-
-            count -= 1
-        kill.wait(interval)
+    try:
+        # Event codes are assigned by each server, so they are resolved just once per connection
+        eventCodes = []
+        for display in displays:
+            ee = display.extension_event
+            # RandR notify events share the same type, and are told apart by their subcode
+            subEvents: dict[int, str] = {
+                ee.CrtcChangeNotify[1]: "crtc_change",
+                ee.OutputChangeNotify[1]: "output_change"
+            }
+            eventCodes.append((display, ee.ScreenChangeNotify, ee.CrtcChangeNotify[0], subEvents))
+
+        while not kill.is_set():
+
+            for display, screenChangeType, notifyType, subEvents in eventCodes:
+
+                count = display.pending_events()
+                while count > 0 and not kill.is_set():
+
+                    e = display.next_event()
+
+                    if e.type == screenChangeType:
+                        # Screen change
+                        _monitorCache.invalidate()
+                        if callback is not None:
+                            callback("screen_change", e)
+
+                    elif e.type == notifyType:
+                        # CRTC or output information has changed
+                        eventName = subEvents.get(e.sub_code)
+                        if eventName is not None:
+                            _monitorCache.invalidate()
+                            if callback is not None:
+                                callback(eventName, e)
+
+                    count -= 1
+                    if count == 0:
+                        # Reading from the socket may have queued more events than counted. Those must be processed
+                        # now, since select() below only wakes up on new data arriving to the socket
+                        count = display.pending_events()
+
+            # All pending events have been read from the connections, so select() will return only on new ones
+            for key, _ in selector.select():
+                if key.fileobj is wakeup:
+                    try:
+                        wakeup.recv(1024)
+                    except OSError:
+                        pass
+    finally:
+        selector.close()
+        wakeup.close()
+        for display in displays:
+            try:
+                display.close()
+            except:
+                pass
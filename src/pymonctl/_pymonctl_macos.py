@@ -87,12 +87,12 @@ def _arrangeMonitors(arrangement: dict[str, dict[str, Optional[Union[str, int, P
     monitors = _NSgetAllMonitorsDict()
     primaryPresent = False
     setAsPrimary = ""
-    for monName in arrangement.keys():
+    for monName in arrangement:
         relPos = arrangement[monName]["relativePos"]
         relMon = arrangement[monName].get("relativeTo", "")
-        if (monName not in monitors.keys() or
+        if (monName not in monitors or
                 ((isinstance(relPos, Position) or isinstance(relPos, int)) and
-                 ((relMon and relMon not in monitors.keys()) or (not relMon and relPos != Position.PRIMARY)))):
+                 ((relMon and relMon not in monitors) or (not relMon and relPos != Position.PRIMARY)))):
             return
         elif relPos == Position.PRIMARY or relPos == (0, 0) or relPos == Point(0, 0):
             setAsPrimary = monName
@@ -112,7 +112,7 @@ def _arrangeMonitors(arrangement: dict[str, dict[str, Optional[Union[str, int, P
         Quartz.CGCancelDisplayConfiguration(configRef)
         return
 
-    for monName in arrangement.keys():
+    for monName in arrangement:
 
         relativePos: Union[Position, int, Point, Tuple[int, int]] = arrangement[monName]["relativePos"]
 
@@ -128,7 +128,7 @@ def _arrangeMonitors(arrangement: dict[str, dict[str, Optional[Union[str, int, P
                              "size": Size(frame.size.width, frame.size.height)}
 
                 frame = monitors[relativeTo]["screen"].frame()
-                if relativeTo in newPos.keys():
+                if relativeTo in newPos:
                     relX, relY = newPos[relativeTo]["x"], newPos[relativeTo]["y"]
                 else:
                     relX, relY = x, y
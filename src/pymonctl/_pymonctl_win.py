@@ -121,12 +121,12 @@ def _arrangeMonitors(arrangement: dict[str, dict[str, Optional[Union[str, int, P
     monitors = _win32getAllMonitorsDict()
     primaryPresent = False
     setAsPrimary = ""
-    for monName in arrangement.keys():
+    for monName in arrangement:
         relPos = arrangement[monName]["relativePos"]
         relMon = arrangement[monName].get("relativeTo", "")
-        if (monName not in monitors.keys() or
+        if (monName not in monitors or
                 ((isinstance(relPos, Position) or isinstance(relPos, int)) and
-                 ((relMon and relMon not in monitors.keys()) or (not relMon and relPos != Position.PRIMARY)))):
+                 ((relMon and relMon not in monitors) or (not relMon and relPos != Position.PRIMARY)))):
             return
         elif relPos == Position.PRIMARY or relPos == (0, 0) or relPos == Point(0, 0):
             setAsPrimary = monName
@@ -145,7 +145,7 @@ def _arrangeMonitors(arrangement: dict[str, dict[str, Optional[Union[str, int, P
     win32api.ChangeDisplaySettingsEx(setAsPrimary, devmode, flags)
     newPos[setAsPrimary] = {"x": 0, "y": 0}
 
-    for monName in arrangement.keys():
+    for monName in arrangement:
 
         if monName != setAsPrimary:
 
@@ -163,7 +163,7 @@ def _arrangeMonitors(arrangement: dict[str, dict[str, Optional[Union[str, int, P
 
                 relMonInfo = monitors[relativeTo]["monitor"]
                 x, y, r, b = relMonInfo["Monitor"]
-                if relativeTo in newPos.keys():
+                if relativeTo in newPos:
                     relX, relY = newPos[relativeTo]["x"], newPos[relativeTo]["y"]
                 else:
                     relX, relY = x, y
@@ -0,0 +1,388 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import math
+import types
+import unittest
+from typing import Any, Callable, List, Optional, Tuple
+from unittest import mock
+
+import Xlib.display
+
+try:
+    from pymonctl import _pymonctl_linux as _linux
+except Exception:
+    # Not Linux, or no X server to connect to (module connects to it on import, through ewmhlib)
+    raise unittest.SkipTest("Linux module can't be imported")
+
+
+def _xrandrRamp(size: int, gamma: float, brightness: float) -> List[int]:
+    # Same ramp "xrandr --gamma gamma --brightness brightness" sets
+    return [int(min(math.pow(i / (size - 1), 1.0 / gamma) * brightness, 1.0) * 65535.0) for i in range(size)]
+
+
+def _testMonitor() -> _linux.LinuxMonitor:
+    # Monitor not bound to a real one (all its data is got through patched functions)
+    monitor = _linux.LinuxMonitor.__new__(_linux.LinuxMonitor)
+    monitor.handle, monitor.name = 1, "TEST-1"
+    return monitor
+
+
+def _testMonitorData(name: str, output: int, x: int, y: int, width: int, height: int) -> _linux._MonitorData:
+    monitor = _linux._Monitor(name, 0, x, y, width, height, 0, 0, [output])
+    return _linux._MonitorData(mock.Mock(), mock.Mock(), mock.Mock(), mock.Mock(), monitor, name, output, mock.Mock(),
+                               output, mock.Mock())
+
+
+class TestQueryMonitors(unittest.TestCase):
+
+    def setUp(self):
+        # Only the methods real connections have can be used (RandR opcode is kept by the protocol display)
+        self.display = mock.Mock(spec=Xlib.display.Display)
+        self.display.display = mock.Mock(spec=Xlib.display._BaseDisplay)
+        self.display.display.get_extension_major.return_value = 140
+        self.display.get_atom_name.side_effect = lambda atom: "MON-%d" % atom
+        self.events: List[Tuple[str, str, int]] = []
+        # Request (as action and request name) which will fail, if any
+        self.failure: Optional[Tuple[str, str]] = None
+        monitors = [types.SimpleNamespace(name=101, primary=1, crtcs=[10]),
+                    types.SimpleNamespace(name=102, primary=0, crtcs=[11]),
+                    types.SimpleNamespace(name=103, primary=0, crtcs=[12])]
+        # Two screens (roots 1 and 2), only first one having monitors
+        patchers = [
+            mock.patch.object(_linux, "_roots", [(self.display, mock.Mock(), 1), (self.display, mock.Mock(), 2)]),
+            mock.patch.dict(_linux._atomNames),
+            mock.patch.dict(_linux._atoms),
+            mock.patch.object(_linux.randr, "GetMonitors",
+                              self._request("monitors", "window", {1: {"monitors": monitors}, 2: {"monitors": []}})),
+            mock.patch.object(_linux.randr, "GetScreenResourcesCurrent",
+                              self._request("resources", "window", {1: {"config_timestamp": 5}, 2: {}})),
+            mock.patch.object(_linux.randr, "get_screen_resources_current", return_value=mock.Mock(config_timestamp=5)),
+            mock.patch.object(_linux.randr, "GetOutputInfo",
+                              self._request("output", "output", {10: {"crtc": 20}, 11: {"crtc": 21}, 12: {"crtc": 0}})),
+            mock.patch.object(_linux.randr, "GetCrtcInfo", self._request("crtc", "crtc", {20: {}, 21: {}}))
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _request(self, name: str, field: str, replies: dict[int, dict[str, Any]]) -> Callable[..., mock.Mock]:
+
+        def reply(key: int):
+            if self.failure == ("reply", name):
+                raise RuntimeError("Reply failed")
+            self.events.append(("reply", name, key))
+
+        def send(display: Any, opcode: int, defer: bool = False, **fields: Any) -> mock.Mock:
+            # Requests must be sent through the protocol display, using RandR opcode, and not wait for their reply
+            self.assertIs(display, self.display.display)
+            self.assertEqual(opcode, 140)
+            self.assertTrue(defer)
+            if self.failure == ("send", name):
+                raise RuntimeError("Request failed")
+            key = fields[field]
+            request = mock.Mock(**replies[key])
+            request.reply.side_effect = lambda: reply(key)
+            self.events.append(("send", name, key))
+            return request
+
+        return send
+
+    def test_pipelined(self):
+        monitorsData = _linux._XqueryMonitorsData()
+        self.assertEqual([(monitorData[5], monitorData[6], monitorData[8]) for monitorData in monitorsData],
+                         [("MON-101", 10, 20), ("MON-102", 11, 21)])
+        # Monitors and resources of all roots are requested before reading any reply. Then all output requests of
+        # each root are sent before reading any of their replies, and the same for the crtcs in use
+        self.assertEqual(self.events, [
+            ("send", "monitors", 1), ("send", "resources", 1), ("send", "monitors", 2), ("send", "resources", 2),
+            ("reply", "monitors", 1), ("reply", "resources", 1),
+            ("send", "output", 10), ("send", "output", 11), ("send", "output", 12),
+            ("reply", "output", 10), ("reply", "output", 11), ("reply", "output", 12),
+            ("send", "crtc", 20), ("send", "crtc", 21),
+            ("reply", "crtc", 20), ("reply", "crtc", 21),
+            ("reply", "monitors", 2)
+        ])
+
+    def test_fallback(self):
+        # Any failure getting monitors from RandR (e.g. in Cinnamon) falls back to build them from active outputs
+        fallback = [types.SimpleNamespace(name="XR-1", primary=1, crtcs=[11])]
+        for failure in (("send", "monitors"), ("reply", "monitors")):
+            self.failure = failure
+            with self.subTest(failure=failure), \
+                    mock.patch.object(_linux, "_RgetAllMonitors", return_value=fallback) as getAllMonitors:
+                monitorsData = _linux._XqueryMonitorsData()
+                self.assertEqual([(monitorData[5], monitorData[6], monitorData[8]) for monitorData in monitorsData],
+                                 [("XR-1", 11, 21)])
+                # Fallback already returns the monitors of all roots
+                getAllMonitors.assert_called_once_with()
+
+
+class TestGammaValues(unittest.TestCase):
+
+    def _values(self, red: List[int], green: List[int], blue: List[int]) -> Tuple[float, Tuple[float, float, float]]:
+        values = _linux._XgetGammaValues(red, green, blue)
+        assert values is not None
+        return values
+
+    def test_identity(self):
+        # Default ramp set by X server
+        ramp = [(i << 8) + i for i in range(256)]
+        brightness, gamma = self._values(ramp, ramp, ramp)
+        self.assertAlmostEqual(brightness, 1.0, places=3)
+        for value in gamma:
+            self.assertAlmostEqual(value, 1.0, places=2)
+
+    def test_brightness_roundtrip(self):
+        for size in (256, 1024):
+            for brightness in range(1, 101):
+                ramp = _xrandrRamp(size, 1.0, brightness / 100)
+                values = self._values(ramp, ramp, ramp)
+                self.assertEqual(round(values[0] * 100), brightness, (size, brightness))
+
+    def test_gamma_roundtrip(self):
+        for brightness in (100, 57, 20):
+            for contrast in range(10, 101, 10):
+                ramp = _xrandrRamp(256, contrast / 100, brightness / 100)
+                values = self._values(ramp, ramp, ramp)
+                for value in values[1]:
+                    self.assertEqual(round(100 / value), contrast, (brightness, contrast))
+
+    def test_channels(self):
+        red, green, blue = _xrandrRamp(256, 0.8, 0.9), _xrandrRamp(256, 1.0, 0.9), _xrandrRamp(256, 1.2, 0.9)
+        brightness, (r, g, b) = self._values(red, green, blue)
+        self.assertEqual(round(brightness * 100), 90)
+        self.assertEqual((round(1 / r, 2), round(1 / g, 2), round(1 / b, 2)), (0.8, 1.0, 1.2))
+
+    def test_black(self):
+        ramp = [0] * 256
+        self.assertEqual(_linux._XgetGammaValues(ramp, ramp, ramp), (0.0, (1.0, 1.0, 1.0)))
+
+    def test_invalid(self):
+        self.assertIsNone(_linux._XgetGammaValues([], [], []))
+        self.assertIsNone(_linux._XgetGammaValues([0, 1, 2], [0, 1], [0, 1, 2]))
+
+    def test_properties(self):
+        monitor = _testMonitor()
+        for brightness, contrast in ((57, 30), (56, 60), (100, 70), (29, 80)):
+            ramp = _xrandrRamp(256, contrast / 100, brightness / 100)
+            with mock.patch.object(_linux.LinuxMonitor, "_getGamma",
+                                   return_value=_linux._XgetGammaValues(ramp, ramp, ramp)):
+                self.assertEqual(monitor.brightness, brightness)
+                self.assertEqual(monitor.contrast, contrast)
+
+
+class TestBrightness(unittest.TestCase):
+
+    def test_isBrightnessSet(self):
+        for size in (256, 1024):
+            for gamma in (0.5, 1.0, 1.3):
+                for brightness in range(0, 101):
+                    ramp = _xrandrRamp(size, gamma, brightness / 100)
+                    self.assertTrue(_linux._XisBrightnessSet(ramp, ramp, ramp, brightness / 100),
+                                    (size, gamma, brightness))
+                    for target in (brightness - 1, brightness + 1):
+                        if 0 <= target <= 100:
+                            self.assertFalse(_linux._XisBrightnessSet(ramp, ramp, ramp, target / 100),
+                                             (size, gamma, brightness, target))
+
+    def test_setBrightness(self):
+        monitor = _testMonitor()
+        for current, target, expected in ((57, 56, True), (57, 57, False), (58, 57, True), (29, 28, True),
+                                          (29, 29, False), (100, 100, False), (0, 1, True)):
+            ramp = _xrandrRamp(256, 1.0, current / 100)
+            with mock.patch.object(_linux.LinuxMonitor, "_getGammaRamps", return_value=(ramp, ramp, ramp)), \
+                    mock.patch.object(_linux, "_runProc", return_value=(0, "")) as runProc:
+                monitor.setBrightness(target)
+                self.assertEqual(runProc.called, expected, (current, target))
+                if expected:
+                    self.assertEqual(runProc.call_args[0][0][-2:], ["--brightness", str(target / 100)])
+
+
+class TestRotation(unittest.TestCase):
+
+    def test_rotationIndex(self):
+        # Crtc not in use
+        self.assertEqual(_linux._rotationIndex(0), 0)
+        for rotation, index, xrandrName in ((_linux.randr.Rotate_0, 0, "normal"), (_linux.randr.Rotate_90, 1, "left"),
+                                            (_linux.randr.Rotate_180, 2, "inverted"),
+                                            (_linux.randr.Rotate_270, 3, "right")):
+            self.assertEqual(_linux._rotationIndex(rotation), index)
+            # Reflection bits are higher than rotation ones, so they must be ignored
+            self.assertEqual(_linux._rotationIndex(rotation | _linux.randr.Reflect_X | _linux.randr.Reflect_Y), index)
+            # Same name xrandr uses for that rotation, so the value set is the value got
+            self.assertEqual(_linux._rotations[index], xrandrName)
+
+
+class TestMonitorCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = _linux._MonitorCache()
+        self.monitorsData = [_testMonitorData("TEST-1", 1, 0, 0, 1920, 1080)]
+        self.query = mock.Mock(return_value=self.monitorsData)
+        self.now = 100.0
+        patchers = [mock.patch.object(_linux, "_XqueryMonitorsData", self.query),
+                    mock.patch.object(_linux.time, "monotonic", lambda: self.now)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_ttl(self):
+        # No events listener: info is only kept for a short time
+        with mock.patch.object(self.cache, "start", return_value=False):
+            self.assertEqual(self.cache.getMonitorsData(), self.monitorsData)
+            self.now += _linux._noEventsTTL / 2
+            self.assertEqual(self.cache.getMonitorsCount(), 1)
+            self.assertEqual(self.query.call_count, 1)
+            self.now += _linux._noEventsTTL
+            self.cache.getMonitorsData()
+            self.assertEqual(self.query.call_count, 2)
+            # Changes made by this module are applied right away
+            self.cache.invalidate()
+            self.cache.getMonitorsData()
+            self.assertEqual(self.query.call_count, 3)
+
+    def test_events(self):
+        # Events listener running: info is kept until a change is notified, no matter how long it takes
+        with mock.patch.object(self.cache, "start", return_value=True):
+            self.cache.getMonitorsData()
+            self.now += _linux._noEventsTTL * 100
+            self.cache.getMonitorsData()
+            self.assertEqual(self.query.call_count, 1)
+            self.cache.invalidate()
+            self.cache.getMonitorsData()
+            self.assertEqual(self.query.call_count, 2)
+
+    def test_lookups(self):
+        with mock.patch.object(self.cache, "start", return_value=False):
+            self.assertEqual(self.cache.getMonitorsData(1), self.monitorsData)
+            self.assertEqual(self.cache.getMonitorsData(2), [])
+            self.assertIs(self.cache.getMonitorByName("TEST-1"), self.monitorsData[0])
+            self.assertIsNone(self.cache.getMonitorByName("TEST-2"))
+            # Callers get their own list
+            self.cache.getMonitorsData().clear()
+            self.assertEqual(self.cache.getMonitorsCount(), 1)
+
+    def test_findMonitors(self):
+        # Given in no particular order, with a monitor on the left of primary, a vertical stack and a mirrored one
+        self.monitorsData[:] = [_testMonitorData("RIGHT", 1, 1920, 0, 1920, 1080),
+                                _testMonitorData("LEFT", 2, -1280, 56, 1280, 1024),
+                                _testMonitorData("PRIMARY", 3, 0, 0, 1920, 1080),
+                                _testMonitorData("TOP", 4, 0, -1080, 1920, 1080),
+                                _testMonitorData("MIRROR", 5, 1920, 0, 1920, 1080)]
+        with mock.patch.object(self.cache, "start", return_value=False):
+            for x, y in ((-1280, 56), (-1, 500), (0, 0), (100, -1), (1919, 1079), (1920, 0), (3839, 1079),
+                         (3840, 0), (-1281, 56), (-100, 0), (500, 2000)):
+                expected = [monitorData.monName for monitorData in self.monitorsData
+                            if _linux._pointInBox(x, y, monitorData.monitor.x, monitorData.monitor.y,
+                                                  monitorData.monitor.width_in_pixels,
+                                                  monitorData.monitor.height_in_pixels)]
+                found = [monitorData.monName for monitorData in self.cache.findMonitors(x, y)]
+                self.assertEqual(sorted(found), sorted(expected), (x, y))
+            self.assertEqual(sorted(monitorData.monName for monitorData in self.cache.findMonitors(2000, 10)),
+                             ["MIRROR", "RIGHT"])
+            self.assertEqual(self.cache.findMonitors(500, 2000), [])
+
+_XRANDR_VERBOSE = """Screen 0: minimum 320 x 200, current 3840 x 1080, maximum 16384 x 16384
+eDP-1 connected primary 1920x1080+0+0 (0x48) normal (normal left inverted right x axis y axis) 344mm x 194mm
+\tIdentifier: 0x42
+\tTimestamp:  25638
+\tSubpixel:   unknown
+\tGamma:      1.0:1.0:1.0
+\tBrightness: 0.80
+\tClones:
+\tCRTC:       0
+\tCRTCs:      0 1 2
+\tEDID:
+\t\t00ffffffffffff0006af3d5700000000
+\t\t001a0104a51f1178028d15a156529d28
+  1920x1080 (0x48) 141.000MHz +HSync -VSync *current +preferred
+        h: width  1920 start 1936 end 1952 total 2104 skew    0 clock  67.02KHz
+        v: height 1080 start 1083 end 1097 total 1116           clock  60.05Hz
+HDMI-1 connected 1920x1080+1920+0 (0x4a) normal (normal left inverted right x axis y axis) 527mm x 296mm
+\tGamma:      1.1:1.0:0.91
+\tBrightness: 1.0
+  1920x1080 (0x4a) 148.500MHz +HSync +VSync *current +preferred
+DP-1 disconnected (normal left inverted right x axis y axis)
+\tGamma:      1.0:1.0:1.0
+\tBrightness: 0.0
+"""
+
+
+class TestXrandrVerbose(unittest.TestCase):
+
+    def setUp(self):
+        _linux._RinvalidateBrightnessAndGamma()
+        self.addCleanup(_linux._RinvalidateBrightnessAndGamma)
+        self.now = 100.0
+        patcher = mock.patch.object(_linux.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parse(self):
+        self.assertEqual(_linux._RparseVerbose(_XRANDR_VERBOSE), {
+            "eDP-1": ("0.80", "1.0:1.0:1.0"),
+            "HDMI-1": ("1.0", "1.1:1.0:0.91"),
+            "DP-1": ("0.0", "1.0:1.0:1.0")
+        })
+        self.assertEqual(_linux._RparseVerbose(""), {})
+
+    def test_cached(self):
+        with mock.patch.object(_linux.subprocess, "run", return_value=mock.Mock(stdout=_XRANDR_VERBOSE)) as run:
+            self.assertEqual(_linux._RgetBrightnessAndGamma("eDP-1"), ("0.80", "1.0:1.0:1.0"))
+            self.assertEqual(_linux._RgetBrightnessAndGamma("HDMI-1"), ("1.0", "1.1:1.0:0.91"))
+            self.assertEqual(_linux._RgetBrightnessAndGamma("VGA-1"), (None, None))
+            self.assertEqual(run.call_count, 1)
+            self.now += _linux._verboseTTL
+            _linux._RgetBrightnessAndGamma("eDP-1")
+            self.assertEqual(run.call_count, 2)
+            # Values just set must not be taken from previous output
+            _linux._RinvalidateBrightnessAndGamma()
+            _linux._RgetBrightnessAndGamma("eDP-1")
+            self.assertEqual(run.call_count, 3)
+
+    def test_notAvailable(self):
+        with mock.patch.object(_linux.subprocess, "run", side_effect=FileNotFoundError):
+            self.assertEqual(_linux._RgetBrightnessAndGamma("eDP-1"), (None, None))
+
+
+_XRANDR_CURRENT = """Screen 0: minimum 320 x 200, current 4480 x 1440, maximum 16384 x 16384
+eDP-1 connected 1920x1080+0+360 (normal left inverted right x axis y axis) 344mm x 194mm
+   1920x1080     60.05*+
+HDMI-1 connected primary 2560x1440+1920+0 (normal left inverted right x axis y axis) 597mm x 336mm
+   2560x1440     59.95*+
+DP-1 connected 1280x1024+-1280+0 left (normal left inverted right x axis y axis) 376mm x 301mm
+   1280x1024     60.02*+
+DP-2 disconnected 1024x768+0+0 (normal left inverted right x axis y axis) 0mm x 0mm
+DP-3 disconnected (normal left inverted right x axis y axis)
+VIRTUAL-1 connected (normal left inverted right x axis y axis)
+"""
+
+
+class TestXrandrCurrent(unittest.TestCase):
+
+    def test_active(self):
+        with mock.patch.object(_linux, "_runProc", return_value=(0, _XRANDR_CURRENT)):
+            self.assertEqual(_linux._RgetMonitorsInfo(), [
+                ("eDP-1", 0, 0, 360, 1920, 1080),
+                ("HDMI-1", 1, 1920, 0, 2560, 1440),
+                ("DP-1", 0, -1280, 0, 1280, 1024)
+            ])
+
+    def test_allOutputs(self):
+        with mock.patch.object(_linux, "_runProc", return_value=(0, _XRANDR_CURRENT)):
+            self.assertEqual(_linux._RgetMonitorsInfo(activeOnly=False), [
+                ("eDP-1", 0, 0, 360, 1920, 1080),
+                ("HDMI-1", 1, 1920, 0, 2560, 1440),
+                ("DP-1", 0, -1280, 0, 1280, 1024),
+                ("DP-2", 0, 0, 0, 1024, 768)
+            ])
+
+    def test_noOutput(self):
+        with mock.patch.object(_linux, "_runProc", return_value=(1, "")):
+            self.assertEqual(_linux._RgetMonitorsInfo(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()